@@ -45,11 +45,39 @@ from helpers.tools.managers import (
     has_donator
     )
 
+from .services import (
+    ForceNicknames,
+    MessageContext,
+    MessagePipeline,
+    SelfAliasIndex,
+    SpeakRoutes,
+    Storage,
+    WebhookForwarder
+    )
+
 class Donator(Cog):
     def __init__(self, bot):
         self.bot = bot
         self.locks = defaultdict(asyncio.Lock)
-        self.speak_cache = {}
+        self.forwarder = WebhookForwarder(bot)
+    
+    async def cog_load(self):
+        self.storage = await Storage.attach(self.bot)
+        self.selfaliases = SelfAliasIndex(self.storage)
+        await self.selfaliases.load()
+        self.forcenicks = ForceNicknames(self.storage)
+        await self.forcenicks.load()
+        self.speak_routes = SpeakRoutes(self.storage)
+        await self.speak_routes.load()
+        self.pipeline = await MessagePipeline.attach(self.bot)
+        self.pipeline.register("speak", self.speak_check, priority=50)
+        self.pipeline.register("selfalias", self.selfalias_check, priority=90)
+    
+    async def cog_unload(self):
+        self.pipeline.unregister("speak")
+        self.pipeline.unregister("selfalias")
+        await self.forwarder.close()
+        await Storage.release(self.bot)
     
     @command(
         name="makemp3",
@@ -282,9 +310,14 @@ class Donator(Cog):
         """
         Speak as the bot.
         """
-        self.speak_cache[ctx.channel.id] = (channel.id, option)
-        status = {'enabled' if state else 'disabled'}
-        await ctx.approve(f"{status.capitalize()} forwarding message!\n\nI will now forward any message that were sent in this channel to {channel.mention}\n\n_ Mention {channel.mention} again with state to `false` to stop forwarding._")
+        if not state:
+            if not await self.speak_routes.remove(ctx.channel.id):
+                return await ctx.warn("This channel is not forwarding messages!")
+
+            return await ctx.approve(f"Disabled forwarding message!\n\nI will no longer forward messages sent in this channel to {channel.mention}")
+
+        await self.speak_routes.add(ctx.guild.id, ctx.channel.id, channel.id)
+        await ctx.approve(f"Enabled forwarding message!\n\nI will now forward any message that were sent in this channel to {channel.mention}\n\n_ Mention {channel.mention} again with state to `false` to stop forwarding._")
     
     # SELFALIAS
     @group(
@@ -327,27 +360,17 @@ class Donator(Cog):
         if len(shortcut) > 10:
             return await ctx.warn("Shortcut **cannot** be longer than **10** characters!")
             
-        async with self.bot.db.cursor() as cursor:
-            await cursor.execute(
-                """
-                SELECT *
-                FROM selfaliases 
-                WHERE user_id = ? 
-                AND alias = ?
-                """,
-                (ctx.author.id, shortcut)
-            )
-            if await cursor.fetchone():
-                return await ctx.warn(f"Selfalias `{shortcut}` **already** exists")
-
-            await cursor.execute(
-                """
-                INSERT INTO selfaliases (user_id, alias, command)
-                VALUES (?, ?, ?)
-                """,
-                (ctx.author.id, shortcut, original_command.qualified_name)
-            )
-            await self.bot.db.commit()
+        if await self.selfaliases.get(ctx.author.id, shortcut):
+            return await ctx.warn(f"Selfalias `{shortcut}` **already** exists")
+
+        await self.storage.execute(
+            """
+            INSERT INTO selfaliases (user_id, alias, command)
+            VALUES (?, ?, ?)
+            """,
+            (ctx.author.id, shortcut, original_command.qualified_name)
+        )
+        self.selfaliases.add(ctx.author.id, shortcut, original_command.qualified_name)
 
         await ctx.approve(f"Added `{shortcut}` as an alias for `{original_command.qualified_name}`")
 
@@ -367,32 +390,21 @@ class Donator(Cog):
         """
         Remove a selfalias for a command.
         """
-        async with self.bot.db.cursor() as cursor:
-            await cursor.execute(
-                """
-                SELECT command
-                FROM selfaliases
-                WHERE user_id = ? 
-                AND alias = ?
-                """,
-                (ctx.author.id, shortcut)
-            )
-            alias_result = await cursor.fetchone()
+        alias_command = await self.selfaliases.get(ctx.author.id, shortcut)
+        if not alias_command:
+            return await ctx.warn(f"Selfalias `{shortcut}` does **not** exist")
         
-            if not alias_result:
-                return await ctx.warn(f"Selfalias `{shortcut}` does **not** exist")
-            
-            await cursor.execute(
-                """
-                DELETE FROM selfaliases
-                WHERE user_id = ? 
-                AND alias = ?
-                """,
-                (ctx.author.id, shortcut)
-            )
-            await self.bot.db.commit()
+        await self.storage.execute(
+            """
+            DELETE FROM selfaliases
+            WHERE user_id = ? 
+            AND alias = ?
+            """,
+            (ctx.author.id, shortcut)
+        )
+        self.selfaliases.remove(ctx.author.id, shortcut)
             
-        await ctx.approve(f"Removed selfalias `{shortcut}` for `{alias_result[0]}`")
+        await ctx.approve(f"Removed selfalias `{shortcut}` for `{alias_command}`")
 
     @selfalias.command(
         name="list",
@@ -405,18 +417,9 @@ class Donator(Cog):
         """
         List all of your command selfaliases.
         """
-        async with self.bot.db.cursor() as cursor:
-            await cursor.execute(
-                """
-                SELECT alias, command 
-                FROM selfaliases
-                WHERE user_id = ?
-                """, 
-                (ctx.author.id,)
-            )
-            results = await cursor.fetchall()
-            if not results:
-                return await ctx.warn("You don't have any selfalias to list")
+        results = (await self.selfaliases.aliases(ctx.author.id)).items()
+        if not results:
+            return await ctx.warn("You don't have any selfalias to list")
 
         embed = Embed(
             color=config.Color.base,
@@ -443,15 +446,14 @@ class Donator(Cog):
         """
         await ctx.prompt("Are you sure you want to **reset** all of your command selfalias?")
         
-        async with self.bot.db.cursor() as cursor:
-            await cursor.execute(
-                """
-                DELETE FROM selfaliases 
-                WHERE user_id = ?
-                """, 
-                (ctx.author.id,)
-            )
-            await self.bot.db.commit()
+        await self.storage.execute(
+            """
+            DELETE FROM selfaliases 
+            WHERE user_id = ?
+            """, 
+            (ctx.author.id,)
+        )
+        self.selfaliases.reset(ctx.author.id)
             
         await ctx.approve("All of your command selfaliases have been removed")
     
@@ -503,50 +505,41 @@ class Donator(Cog):
         """
         nickname = shorten(nickname, 32)
         
-        async with self.bot.db.cursor() as cursor:
-            await cursor.execute(
+        if self.forcenicks.get(ctx.guild.id, member.id) is not None:
+            await self.storage.execute(
                 """
-                SELECT * 
-                FROM forcenick
-                WHERE guild_id = ? 
+                UPDATE forcenick
+                SET nickname = ?
+                WHERE guild_id = ?
                 AND user_id = ?
                 """,
-                (ctx.guild.id, member.id)
+                (nickname, ctx.guild.id, member.id)
             )
-            results = await cursor.fetchone()
-            if results:
-                await cursor.execute(
-                    """
-                    UPDATE forcenick
-                    SET nickname = ?
-                    WHERE guild_id = ?
-                    AND user_id = ?
-                    """,
-                    (nickname, ctx.guild.id, member.id)
-                )
-                await self.bot.db.commit()
-                try:
-                    await member.edit(nick=nickname)
-                    return await ctx.approve(f"Updated **existing forcenickname** for {member.mention} to **{nickname}**")
-                    
-                except Forbidden:
-                    await ctx.warn(f"Missing permission to update the **nickname**, but the **forcenick** is **already** set for {member.mention}")
-            
-            else:
-                await cursor.execute(
-                    """
-                    INSERT INTO forcenick (user_id, nickname, guild_id, previous_nick) 
-                    VALUES (?, ?, ?, ?)
-                    """,
-                    (member.id, nickname, ctx.guild.id, member.nick)
-                )
-                await self.bot.db.commit()
-                try:
-                    await member.edit(nick=nickname)
-                    return await ctx.approve(f"Fornickname set for {member.mention} to **{nickname}**")
-                    
-                except Forbidden:
-                    await ctx.warn(f"Missing permission to update the **nickname**, but the **forcenick** is **already** set for {member.mention}")
+            self.forcenicks.set(ctx.guild.id, member.id, nickname)
+            try:
+                self.forcenicks.editing(member)
+                await member.edit(nick=nickname)
+                return await ctx.approve(f"Updated **existing forcenickname** for {member.mention} to **{nickname}**")
+                
+            except Forbidden:
+                await ctx.warn(f"Missing permission to update the **nickname**, but the **forcenick** is **already** set for {member.mention}")
+        
+        else:
+            await self.storage.execute(
+                """
+                INSERT INTO forcenick (user_id, nickname, guild_id, previous_nick) 
+                VALUES (?, ?, ?, ?)
+                """,
+                (member.id, nickname, ctx.guild.id, member.nick)
+            )
+            self.forcenicks.set(ctx.guild.id, member.id, nickname)
+            try:
+                self.forcenicks.editing(member)
+                await member.edit(nick=nickname)
+                return await ctx.approve(f"Fornickname set for {member.mention} to **{nickname}**")
+                
+            except Forbidden:
+                await ctx.warn(f"Missing permission to update the **nickname**, but the **forcenick** is **already** set for {member.mention}")
 
     @forcenickname.command(
         name="remove",
@@ -565,29 +558,27 @@ class Donator(Cog):
         """
         Remove the force nickname of a member.
         """
-        async with self.bot.db.cursor() as cursor:
-            await cursor.execute(
-                """
-                SELECT previous_nick 
-                FROM forcenick 
-                WHERE user_id = ?
-                AND guild_id = ?
-                """,
-                (member.id, ctx.guild.id)
-            )
-            data = await cursor.fetchone()
-            if not data:
-                return await ctx.warn(f"{member.mention} is **not** force nicknamed")
-
-            await cursor.execute(
-                """
-                DELETE FROM forcenick 
-                WHERE user_id = ?
-                AND guild_id = ?
-                """, 
-                (member.id, ctx.guild.id)
-            )
-            await self.bot.db.commit()
+        data = await self.storage.fetchone(
+            """
+            SELECT previous_nick 
+            FROM forcenick 
+            WHERE user_id = ?
+            AND guild_id = ?
+            """,
+            (member.id, ctx.guild.id)
+        )
+        if not data:
+            return await ctx.warn(f"{member.mention} is **not** force nicknamed")
+
+        await self.storage.execute(
+            """
+            DELETE FROM forcenick 
+            WHERE user_id = ?
+            AND guild_id = ?
+            """, 
+            (member.id, ctx.guild.id)
+        )
+        self.forcenicks.remove(ctx.guild.id, member.id)
 
         try:
             await member.edit(nick=data[0])
@@ -607,18 +598,16 @@ class Donator(Cog):
         """
         List all the force nicknamed members in the server.
         """
-        async with self.bot.db.cursor() as cursor:
-            await cursor.execute(
-                """
-                SELECT user_id, nickname 
-                FROM forcenick 
-                WHERE guild_id = ?
-                """,
-                (ctx.guild.id,)
-            )
-            results = await cursor.fetchall()
-            if not results:
-                return await ctx.warn("This server doesn't have any force nicknamed members to list")
+        results = await self.storage.fetchall(
+            """
+            SELECT user_id, nickname 
+            FROM forcenick 
+            WHERE guild_id = ?
+            """,
+            (ctx.guild.id,)
+        )
+        if not results:
+            return await ctx.warn("This server doesn't have any force nicknamed members to list")
         
         members = []
         for user_id, nickname in results:
@@ -652,41 +641,29 @@ class Donator(Cog):
         """
         await ctx.prompt("Are you sure you want to **reset** all the **force nicknamed** members in the server?")
         
-        async with self.bot.db.cursor() as cursor:
-            await cursor.execute(
-                """
-                DELETE FROM forcenick 
-                WHERE guild_id = ?
-                """,
-                (ctx.guild.id,)
-            )
-            await self.bot.db.commit()
+        await self.storage.execute(
+            """
+            DELETE FROM forcenick 
+            WHERE guild_id = ?
+            """,
+            (ctx.guild.id,)
+        )
+        self.forcenicks.reset(ctx.guild.id)
 
         await ctx.approve("All force nickname data has been cleared. Members can now change their nicknames freely.")
     
     # Asynchronous
     # SELFALIAS
     async def get_selfaliases(self, user_id, alias):
-        async with self.bot.db.cursor() as cursor:
-            await cursor.execute(
-                """
-                SELECT command 
-                FROM selfaliases
-                WHERE user_id = ?
-                AND alias = ?
-                """,
-                (user_id, alias)
-            )
-            result = await cursor.fetchone()
-            return result[0] if result else None
+        return await self.selfaliases.get(user_id, alias)
     
     # SELFALIAS EVENT
-    @Cog.listener("on_message")
-    async def selfalias_check(self, message):
-        if message.author.bot:
+    async def selfalias_check(self, context: MessageContext):
+        message = context.message
+        if message.author.bot or message.author.id not in self.selfaliases.owners:
             return
 
-        ctx = await self.bot.get_context(message)
+        ctx = await context.context()
         if ctx.valid:
             return
 
@@ -702,44 +679,44 @@ class Donator(Cog):
     # FN EVENT
     @Cog.listener("on_member_update")
     async def Forcenickname_check(self, before: Member, after: Member):
-        if before.guild is None:
+        nickname = self.forcenicks.enforce(after)
+        if nickname is None:
             return
 
-        async with self.bot.db.cursor() as cursor:
-            await cursor.execute(
-                """
-                SELECT nickname 
-                FROM forcenick 
-                WHERE user_id = ?
-                AND guild_id = ?
-                """,
-                (before.id, before.guild.id)
-            )
-            data = await cursor.fetchone()
-
-        if data and after.nick != data[0]:
-            try:
-                await after.edit(nick=data[0])
-                
-            except:
-                pass
+        self.forcenicks.editing(after)
+        try:
+            await after.edit(nick=nickname)
+            
+        except HTTPException:
+            pass
     
     # SPEAK EVENT
-    @Cog.listener("on_message")
-    async def speak_check(self, message):
-        if message.author == self.bot.user:
+    async def speak_check(self, context: MessageContext):
+        message = context.message
+        if message.author == self.bot.user or self.forwarder.owns(message.webhook_id):
             return
         
-        if message.channel.id in self.speak_cache:
-            target_channel_id, state = self.speak_cache[message.channel.id]
-            if state:
-                target_channel = self.bot.get_channel(target_channel_id)
-                await target_channel.send(message.content)
-
-        for original_channel_id, (mapped_channel_id, state) in self.speak_cache.items():
-            if message.channel.id == mapped_channel_id and state:
-                original_channel = self.bot.get_channel(original_channel_id)
-                await original_channel.send(f"**{message.author.display_name}:** {message.content}")
+        target_channel_id = self.speak_routes.target(message.channel.id)
+        if target_channel_id is not None:
+            target_channel = self.bot.get_channel(target_channel_id)
+            if target_channel is not None:
+                me = target_channel.guild.me
+                self.forwarder.forward(
+                    target_channel,
+                    message.content,
+                    username=me.display_name,
+                    avatar_url=me.display_avatar.url
+                )
+
+        for original_channel_id in self.speak_routes.sources(message.channel.id):
+            original_channel = self.bot.get_channel(original_channel_id)
+            if original_channel is not None:
+                self.forwarder.forward(
+                    original_channel,
+                    message.content,
+                    username=message.author.display_name,
+                    avatar_url=message.author.display_avatar.url
+                )
         
 async def setup(bot):
     await bot.add_cog(Donator(bot))
\ No newline at end of file
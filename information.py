@@ -21,7 +21,6 @@ from typing import (
 from io import BytesIO
 from random import choice
 from time import time
-from psutil import Process
 from contextlib import suppress
 
 import requests 
@@ -77,9 +76,116 @@ from helpers.tools.managers import HexConverter, HelpView
 from helpers.tools.managers.tools import _handle_search_results
 from helpers.tools.utilities import regex, perform_search, human_timedelta, human_size
 
+from .services import (
+    FanoutSearch,
+    GuildStatsTracker,
+    JoinOrder,
+    MetricsSampler,
+    ResponseCache,
+    ShardStats,
+    Storage,
+    UserResolver,
+    dump_embeds,
+    load_embeds,
+    paginate
+    )
+
 class Information(Cog):
+    cogs_directory = "./cogs"
+    # Searched concurrently, results are taken from the first source in this order that has any.
+    manga_sources = ("anilist", "mangadex", "batoto")
+    manga_timeout = 8.0
+    
     def __init__(self, bot):
         self.bot = bot
+        self.metrics = MetricsSampler()
+        self.manga_search = FanoutSearch(timeout=self.manga_timeout)
+    
+    async def cog_load(self):
+        self.storage = await Storage.attach(self.bot)
+        self.users = UserResolver.attach(self.bot)
+        self.join_order = JoinOrder.attach(self.bot)
+        self.guild_stats = GuildStatsTracker.attach(self.bot)
+        self.shard_stats = ShardStats.attach(self.bot)
+        self.responses = ResponseCache.attach(self.bot, self.storage)
+        await self.responses.prune()
+        self.shard_stats.start()
+        self.metrics.start()
+        await self.metrics.refresh_lines(self.cogs_directory)
+    
+    async def cog_unload(self):
+        self.metrics.stop()
+        self.shard_stats.stop()
+        await Storage.release(self.bot)
+    
+    async def cached_embeds(self, source: str, title: str, search):
+        """
+        Run a search helper that returns embeds through the shared response cache.
+        """
+        return await self.responses.fetch(
+            source,
+            title,
+            lambda: search(title),
+            dump=dump_embeds,
+            load=load_embeds
+        )
+    
+    async def wikipedia_search(self, query: str, language: str):
+        embeds, url = await self.responses.fetch(
+            "wikipedia",
+            (language, query),
+            lambda: perform_search(query, language),
+            dump=lambda result: (dump_embeds(result[0]), result[1]),
+            load=lambda result: (load_embeds(result[0]), result[1]),
+            cacheable=lambda result: bool(result[0])
+        )
+        return embeds, url
+    
+    @Cog.listener("on_member_join")
+    async def member_index_add(self, member: Member):
+        self.join_order.add(member)
+        self.guild_stats.member_join(member)
+        self.shard_stats.member_join(member.guild)
+    
+    @Cog.listener("on_member_remove")
+    async def member_index_remove(self, member: Member):
+        self.join_order.remove(member)
+        self.guild_stats.member_remove(member)
+        self.shard_stats.member_remove(member.guild)
+    
+    @Cog.listener("on_member_update")
+    async def guild_stats_member_update(self, before: Member, after: Member):
+        self.guild_stats.member_update(before, after)
+    
+    @Cog.listener("on_presence_update")
+    async def guild_stats_presence_update(self, before: Member, after: Member):
+        self.guild_stats.member_update(before, after)
+    
+    @Cog.listener("on_guild_channel_create")
+    async def guild_stats_channel_create(self, channel):
+        self.guild_stats.channel_create(channel)
+    
+    @Cog.listener("on_guild_channel_delete")
+    async def guild_stats_channel_delete(self, channel):
+        self.guild_stats.channel_delete(channel)
+    
+    @Cog.listener("on_guild_join")
+    async def shard_stats_guild_join(self, guild: Guild):
+        self.shard_stats.guild_join(guild)
+    
+    @Cog.listener("on_ready")
+    async def shard_stats_ready(self):
+        self.shard_stats.rebuild()
+    
+    @Cog.listener("on_shard_ready")
+    async def shard_stats_shard_ready(self, shard_id: int):
+        self.shard_stats.rebuild()
+    
+    @Cog.listener("on_guild_remove")
+    async def member_index_forget(self, guild: Guild):
+        self.join_order.forget(guild)
+        self.guild_stats.forget(guild)
+        self.shard_stats.guild_remove(guild)
 
     @hybrid_command(
         name="help",
@@ -276,21 +382,19 @@ class Information(Cog):
         """
         View the bot statistics
         """
-        process = Process()
-        cogs_directory = './cogs'
-        total_lines = 0
-        for root, dirs, files in os.walk(cogs_directory):
-            for file in files:
-                if file.endswith(".py"):
-                    with open(os.path.join(root, file), 'r', encoding="utf-8") as f:
-                        total_lines += sum(1 for line in f)
+        sample = self.metrics.latest or await self.metrics.sample()
+        trend = self.metrics.trend()
+        change = sample.memory - trend[0].memory
+        minutes = round((sample.timestamp - trend[0].timestamp) / 60)
+        memory_trend = f" ({'+' if change >= 0 else '-'}{human_size(abs(change), trim=True)} in {minutes}m)" if minutes else ""
 
         embed = Embed(
             description=(
                 f"Bot statistics, developed by qmantha\n"
-                f"**Memory:** {human_size(process.memory_full_info().uss, trim=True)}\n"
+                f"**Memory:** {human_size(sample.memory, trim=True)}{memory_trend}\n"
+                f"**CPU:** {sample.cpu:.1f}% ({sample.fds:,} open files)\n"
                 f"**Commands:** {len(set(self.bot.walk_commands()))}\n"
-                f"**Lines:** {total_lines:,}"
+                f"**Lines:** {self.metrics.lines:,}"
             ),
             timestamp=ctx.message.created_at,
         )
@@ -301,15 +405,10 @@ class Information(Cog):
         embed.set_thumbnail(
             url=self.bot.user.display_avatar.url)
 
+        totals = self.guild_stats.totals(self.bot.guilds)
         total_members = sum(guild.member_count or 0 for guild in self.bot.guilds)
         unique_members = len(self.bot.users)
-
-        online_members = sum(
-            1
-            for guild in self.bot.guilds
-            for member in guild.members
-            if not member.bot and member.status != Status.offline
-        )
+        online_members = totals.online
 
         embed.add_field(
             name="**Users**",
@@ -321,8 +420,8 @@ class Information(Cog):
             inline=True
         )
 
-        text_channels = sum(len(guild.text_channels) for guild in self.bot.guilds)
-        voice_channels = sum(len(guild.voice_channels) for guild in self.bot.guilds)
+        text_channels = totals.text_channels
+        voice_channels = totals.voice_channels
         total_channels = text_channels + voice_channels
 
         embed.add_field(
@@ -368,11 +467,12 @@ class Information(Cog):
         )
 
         for shard in self.bot.shards:
-            guilds = [g for g in self.bot.guilds if g.shard_id == shard]
-            users = sum([g.member_count for g in guilds])
+            guilds, users = self.shard_stats.counts(shard)
+            latency = self.shard_stats.latency(shard)
+            percentiles = f" (p50 `{round(latency[0] * 1000)}ms`, p99 `{round(latency[1] * 1000)}ms`)" if latency else ""
             embed.add_field(
                 name=f"**Shard {shard}**",
-                value=f"**Ping:** `{round(self.bot.shards.get(shard).latency * 1000)}ms`\n**Guilds:** `{len(guilds):,}`\n**Users:** `{users:,}`",
+                value=f"**Ping:** `{round(self.bot.shards.get(shard).latency * 1000)}ms`{percentiles}\n**Guilds:** `{guilds:,}`\n**Users:** `{users:,}`",
                 inline=False
             )
 
@@ -394,28 +494,28 @@ class Information(Cog):
         """
         View the most used commands.
         """
-        async with self.bot.db.cursor() as cursor:
-            await cursor.execute(
-                """
-                SELECT command, uses 
-                FROM topcommands 
-                WHERE uses > 0
-                ORDER BY uses DESC 
-                LIMIT 100
-                """
-            )
-            commands = await cursor.fetchall()
-            if not commands:
-                return await ctx.warn("No commands have been used yet.")
+        commands = await self.storage.fetchall(
+            """
+            SELECT command, uses 
+            FROM topcommands 
+            WHERE uses > 0
+            ORDER BY uses DESC 
+            LIMIT 100
+            """
+        )
+        if not commands:
+            return await ctx.warn("No commands have been used yet.")
 
         embed = Embed(
             color=config.Color.base,
-            title="Top Commands",
-            description="\n".join(f"**{command}:** used `{uses:,}` times" for command, uses in commands)
+            title="Top Commands"
             )
         
-        await ctx.paginate(
+        await paginate(
+            ctx,
             embed,
+            commands,
+            lambda row: f"**{row[0]}:** used `{row[1]:,}` times",
             text="command|commands"
         )
     
@@ -463,20 +563,19 @@ class Information(Cog):
         """
         Search for manga, manhwa, manhua, and lightnovel on various services. (Anilist, MangaDex, Batoto) 
         """
-        msg = await ctx.send(embeds=[discord_embed_source(NAME_ANILIST, COLOR_ANILIST)])
-        embeds = await discord_anilist_embeds(ctx, "MANGA", title)
-        if embeds:
-            return await _handle_search_results(ctx, embeds, msg)
-
-        await msg.edit(embeds=[discord_embed_source(NAME_MANGADEX, COLOR_MANGADEX)])
-        embeds = await discord_mangadex_embeds(title)
-        if embeds:
-            return await _handle_search_results(ctx, embeds, msg)
+        sources = {
+            "anilist": (NAME_ANILIST, COLOR_ANILIST, lambda: discord_anilist_embeds(ctx, "MANGA", title)),
+            "mangadex": (NAME_MANGADEX, COLOR_MANGADEX, lambda: self.cached_embeds("mangadex", title, discord_mangadex_embeds)),
+            "batoto": (NAME_BATOTO, COLOR_BATOTO, lambda: self.cached_embeds("batoto", title, discord_batoto_embeds)),
+        }
+        name, color, _ = sources[self.manga_sources[0]]
+        msg = await ctx.send(embeds=[discord_embed_source(name, color)])
 
-        await msg.edit(embeds=[discord_embed_source(NAME_BATOTO, COLOR_BATOTO)])
-        embeds = await discord_batoto_embeds(title)
-        if embeds:
-            return await _handle_search_results(ctx, embeds, msg)
+        result = await self.manga_search.first(
+            [(source, sources[source][2]) for source in self.manga_sources]
+        )
+        if result:
+            return await _handle_search_results(ctx, result[1], msg)
 
         return await msg.edit(embeds=[discord_embed_source(None)])
 
@@ -613,7 +712,7 @@ class Information(Cog):
         Search for manga, manhwa and manhua on MangaDex.
         """
         msg = await ctx.send(embeds=[discord_embed_source(NAME_MANGADEX, COLOR_MANGADEX)])
-        embeds = await discord_mangadex_embeds(title)
+        embeds = await self.cached_embeds("mangadex", title, discord_mangadex_embeds)
         
         await _handle_search_results(ctx, embeds, msg)
     
@@ -633,7 +732,7 @@ class Information(Cog):
         Search for manga, manhwa, and manhua on Batoto.
         """
         msg = await ctx.send(embeds=[discord_embed_source(NAME_BATOTO, COLOR_BATOTO)])
-        embeds = await discord_batoto_embeds(title)
+        embeds = await self.cached_embeds("batoto", title, discord_batoto_embeds)
         
         await _handle_search_results(ctx, embeds, msg)
         
@@ -652,7 +751,7 @@ class Information(Cog):
         """
         Shows information about a book from Google Books.
         """
-        results = await fetch_google_books(title)
+        results = await self.responses.fetch("books", title, lambda: fetch_google_books(title))
         if results in [None, False]:
             return await ctx.warn(f"No results were found for **{title}**")
 
@@ -695,7 +794,7 @@ class Information(Cog):
         Gets information on English wikipedia.
         """
         async with ctx.typing():
-            embeds, url = await perform_search(query, 'en')
+            embeds, url = await self.wikipedia_search(query, 'en')
         
         if not embeds:
             await ctx.warn(f"Sorry, no results were found for **{query}**")
@@ -725,7 +824,7 @@ class Information(Cog):
         Gets information on English wikipedia.
         """
         async with ctx.typing():
-            embeds, url = await perform_search(query, 'en')
+            embeds, url = await self.wikipedia_search(query, 'en')
         
         if not embeds:
             await ctx.warn(f"Sorry, no results were found for **{query}**")
@@ -756,7 +855,7 @@ class Information(Cog):
         Gets information on Indonesian wikipedia.
         """
         async with ctx.typing():
-            embeds, url = await perform_search(query, 'id')
+            embeds, url = await self.wikipedia_search(query, 'id')
         
         if not embeds:
             await ctx.warn(f"Sorry, no results were found for **{query}**")
@@ -788,7 +887,7 @@ class Information(Cog):
         Gets information on German wikipedia.
         """
         async with ctx.typing():
-            embeds, url = await perform_search(query, 'de')
+            embeds, url = await self.wikipedia_search(query, 'de')
         
         if not embeds:
             return await ctx.warn(f"Sorry, no results were found for **{query}**")
@@ -873,17 +972,13 @@ class Information(Cog):
         Gets the definition of a word/slang from Urban Dictionary.
         """
         await ctx.typing()
-        try:
-            async with self.bot.session.get(
-                "https://api.urbandictionary.com/v0/define",
-                params={"term": word}
-            ) as response:
-                if response.status == 200:
-                    data = await response.json()
-                else:
-                    return await ctx.warn(f"Failed to fetch data. Status: {response.status}")
-        except Exception:
-            raise
+        status, data = await self.responses.get_json(
+            "urbandictionary",
+            "https://api.urbandictionary.com/v0/define",
+            params={"term": word}
+        )
+        if status != 200:
+            return await ctx.warn(f"Failed to fetch data. Status: {status}")
 
         if not data.get('list'):
             return await ctx.warn(f"No results were found for **{word}**")
@@ -936,45 +1031,43 @@ class Information(Cog):
         """
         url = f'https://api.github.com/users/{user}'
         
-        async with self.bot.session.get(url) as response:
-            if response.status != 200:
-                return await ctx.warn(f"No gitHub user were found with name **{user}**")
-            
-            res = await response.json()
-            
-            name = res.get('login')
-            avatar_url = res.get('avatar_url')
-            html_url = res.get('html_url')
-            email = res.get('email')
-            public_repos = res.get('public_repos')
-            followers = res.get('followers')
-            following = res.get('following')
-            twitter = res.get('twitter_username')
-            location = res.get('location')
-            company = res.get('company')
+        status, res = await self.responses.get_json("github", url)
+        if status != 200:
+            return await ctx.warn(f"No gitHub user were found with name **{user}**")
+
+        name = res.get('login')
+        avatar_url = res.get('avatar_url')
+        html_url = res.get('html_url')
+        email = res.get('email')
+        public_repos = res.get('public_repos')
+        followers = res.get('followers')
+        following = res.get('following')
+        twitter = res.get('twitter_username')
+        location = res.get('location')
+        company = res.get('company')
 
-            embed = Embed(
-                color=config.Color.base, 
-                title=f"@{name}", url=html_url,
-                timestamp=utcnow())
-            embed.set_thumbnail(url=avatar_url)
-            embed.add_field(name="**Followers**", value=f"{followers:,}", inline=False)
-            embed.add_field(name="**Following**", value=f"{following:,}", inline=False)
-            embed.add_field(name="**Repository**", value=f"{public_repos:,}", inline=False)
-            
-            if email:
-                embed.add_field(name="**Email**", value=email, inline=False)
-            if location:
-                embed.add_field(name="**Location**", value=location, inline=False)
-            if twitter:
-                embed.add_field(name="**Twitter**", value=twitter, inline=False)
-            if company:
-                embed.add_field(name="**Company**", value=company, inline=False)
+        embed = Embed(
+            color=config.Color.base, 
+            title=f"@{name}", url=html_url,
+            timestamp=utcnow())
+        embed.set_thumbnail(url=avatar_url)
+        embed.add_field(name="**Followers**", value=f"{followers:,}", inline=False)
+        embed.add_field(name="**Following**", value=f"{following:,}", inline=False)
+        embed.add_field(name="**Repository**", value=f"{public_repos:,}", inline=False)
+        
+        if email:
+            embed.add_field(name="**Email**", value=email, inline=False)
+        if location:
+            embed.add_field(name="**Location**", value=location, inline=False)
+        if twitter:
+            embed.add_field(name="**Twitter**", value=twitter, inline=False)
+        if company:
+            embed.add_field(name="**Company**", value=company, inline=False)
 
-            embed.set_footer(
-                text='GitHub', 
-                icon_url='https://cdn.discordapp.com/attachments/1279019189625032755/1306076505536987197/images.png?ex=67355a08&is=67340888&hm=a26b7e41023eeaf1a73dbceb40ae77f2c37005b0a043145724a3ffe07663d567&')
-            await ctx.send(embed=embed)
+        embed.set_footer(
+            text='GitHub', 
+            icon_url='https://cdn.discordapp.com/attachments/1279019189625032755/1306076505536987197/images.png?ex=67355a08&is=67340888&hm=a26b7e41023eeaf1a73dbceb40ae77f2c37005b0a043145724a3ffe07663d567&')
+        await ctx.send(embed=embed)
     
     @command(
         name="randomhex",
@@ -1240,11 +1333,11 @@ class Information(Cog):
         Checks the join position of a member or yourself in the server.
         """
         member = member or ctx.author
-        pos = sum(m.joined_at < member.joined_at for m in sorted(ctx.guild.members, key=lambda m: m.joined_at) if m.joined_at)
+        pos = self.join_order.position(member)
         if member == ctx.author:
-            await ctx.neutral(f"Your join position is **{pos + 1}**")
+            await ctx.neutral(f"Your join position is **{pos:,}**")
         else:
-            await ctx.neutral(f"{member.mention} join position is **{pos + 1}**")
+            await ctx.neutral(f"{member.mention} join position is **{pos:,}**")
         
     @command(
         name="invitecount",
@@ -1430,8 +1523,9 @@ class Information(Cog):
         """
         Show the member count.
         """
-        humans = len([m for m in ctx.guild.members if not m.bot])
-        bots = len([m for m in ctx.guild.members if m.bot])
+        stats = self.guild_stats.get(ctx.guild)
+        humans = stats.humans
+        bots = stats.bots
         members = ctx.guild.member_count
         
         embed = Embed(color=config.Color.base)
@@ -2045,7 +2139,7 @@ class Information(Cog):
             if user.guild_permissions.administrator:
                 footer.append("Administrator")
 
-            join_position = sorted(ctx.guild.members, key=lambda m: m.joined_at or utcnow()).index(user) + 1
+            join_position = self.join_order.position(user)
             footer.append(f"Join position: {join_position:,}")
 
         if user != self.bot.user:
@@ -2082,6 +2176,7 @@ class Information(Cog):
         View information about a server.
         """
         guild = guild_id or ctx.guild
+        stats = self.guild_stats.get(guild)
 
         embed = Embed(
             title=guild.name, 
@@ -2110,8 +2205,8 @@ class Information(Cog):
             name="**Members**",
             value=(
                 f"**Total:** {guild.member_count:,}\n"
-                f"**Humans:** {len([m for m in guild.members if not m.bot]):,}\n"
-                f"**Bots:** {len([m for m in guild.members if m.bot]):,}"
+                f"**Humans:** {stats.humans:,}\n"
+                f"**Bots:** {stats.bots:,}"
             ),
             inline=True,
         )
@@ -2140,7 +2235,7 @@ class Information(Cog):
         )
         embed.add_field(
             name=f"**Channels ({len(guild.channels)})**",
-            value=f"**Text:** {len(guild.text_channels)}\n**Voice:** {len(guild.voice_channels)}\n**Category:** {len(guild.categories)}\n",
+            value=f"**Text:** {stats.text_channels}\n**Voice:** {stats.voice_channels}\n**Category:** {stats.categories}\n",
             inline=True,
         )
         embed.add_field(
@@ -2148,7 +2243,7 @@ class Information(Cog):
             value=(
                 f"**Roles:** {len(guild.roles)}/250\n"
                 f"**Emojis:** {len(guild.emojis)}/{guild.emoji_limit}\n"
-                f"**Boosters:** {len(guild.premium_subscribers):,}\n"
+                f"**Boosters:** {stats.boosters:,}\n"
             ),
             inline=True,
         )
@@ -2205,11 +2300,6 @@ class Information(Cog):
         
         embed = Embed(
             title="Boosters",
-            description="\n".join(
-                f"{member.mention} boosted "
-                + format_dt(member.premium_since, style="R")
-                for member in members
-            ),
             color=config.Color.base
             )
         
@@ -2217,8 +2307,11 @@ class Information(Cog):
             name=ctx.author.name, 
             icon_url=ctx.author.display_avatar.url)
 
-        await ctx.paginate(
+        await paginate(
+            ctx,
             embed,
+            members,
+            lambda member: f"{member.mention} boosted " + format_dt(member.premium_since, style="R"),
             text="booster|boosters"
         )
     
@@ -2232,17 +2325,17 @@ class Information(Cog):
         """
         View a list of most recently lost boosters.
         """
-        async with self.bot.db.cursor() as cursor:
-            await cursor.execute(
-                """
-                SELECT user_id, started_at, expired_at
-                FROM boosters_lost
-                ORDER BY expired_at DESC
-                """
-            )
-            results = await cursor.fetchall()
-            if not results:
-                return await ctx.warn("No **boosters** have been lost recently!")
+        results = await self.storage.fetchall(
+            """
+            SELECT user_id, started_at, expired_at
+            FROM boosters_lost
+            ORDER BY expired_at DESC
+            """
+        )
+        if not results:
+            return await ctx.warn("No **boosters** have been lost recently!")
+        
+        resolved = await self.users.resolve_many(user_id for user_id, *_ in results)
         
         users = []
         for user_id, started_at, expired_at in results:
@@ -2250,7 +2343,7 @@ class Information(Cog):
             started_at = datetime.fromisoformat(started_at).replace(tzinfo=timezone.utc) if started_at else None
             expired_at = datetime.fromisoformat(expired_at).replace(tzinfo=timezone.utc) if expired_at else None
 
-            user = self.bot.get_user(user_id) or await self.bot.fetch_user(user_id)
+            user = resolved[user_id]
             lasted = human_timedelta(started_at, accuracy=1, brief=True, suffix=False) if started_at else "Unknown duration"
             expired_text = format_dt(expired_at, style="R") if expired_at else "Unknown time"
 
@@ -2361,11 +2454,7 @@ class Information(Cog):
         """
         Lists the most recent members who joined the server.
         """
-        members_list = sorted(
-            ctx.guild.members,
-            key=lambda member: member.joined_at or utcnow(),
-            reverse=True
-        )[:amount]
+        members_list = self.join_order.recent(ctx.guild, amount)
 
         members = [
             f"{member.mention} joined {format_dt(member.joined_at, style='R')}"
@@ -2472,24 +2561,23 @@ class Information(Cog):
         """
         View all the server roles and its member count.
         """
-        roles = "\n".join(
-            f"{role.mention} - **{len(role.members)}** {'member' if len(role.members) == 1 else 'members'}"
-            for role in ctx.guild.roles if role.name != "@everyone"
-        )
+        roles = [role for role in ctx.guild.roles if role.name != "@everyone"]
         if not roles:
             return await ctx.warn("No roles found in this server.")
 
         embed = Embed(
             title="With Roles",
-            description=roles,
             color=config.Color.base
             )
         embed.set_author(
             name=ctx.author.name, 
             icon_url=ctx.author.display_avatar.url)
             
-        await ctx.paginate(
+        await paginate(
+            ctx,
             embed,
+            roles,
+            lambda role: f"{role.mention} - **{len(role.members)}** {'member' if len(role.members) == 1 else 'members'}",
             text="role|roles"
         )
     
@@ -2514,28 +2602,23 @@ class Information(Cog):
         if not role.members:
             return await ctx.warn(f"No **members** have the {role.mention} role")
 
-        roles = "\n".join(
-            f"{member.mention}"
-            + (" (you)" if member == ctx.author else "")
-            + (" (bot)" if member.bot else "")
-            for member in role.members
-        )
         embed = Embed(
             title=f"Members in {role}",
-            description="\n".join(
-                f"{member.mention}"
-                + (" (you)" if member == ctx.author else "")
-                + (" (bot)" if member.bot else "")
-                for member in role.members
-            ),
             color=config.Color.base
             )
         embed.set_author(
             name=ctx.author.name, 
             icon_url=ctx.author.display_avatar.url)
 
-        await ctx.paginate(
+        await paginate(
+            ctx,
             embed,
+            role.members,
+            lambda member: (
+                f"{member.mention}"
+                + (" (you)" if member == ctx.author else "")
+                + (" (bot)" if member.bot else "")
+            ),
             text="member|members"
         )
     
@@ -2555,22 +2638,23 @@ class Information(Cog):
         """
         View all the human members in the server.
         """
-        members = "\n".join(f"{member.mention}" for member in ctx.guild.members if not member.bot
-        )
+        members = [member for member in ctx.guild.members if not member.bot]
         if not members:
             return await ctx.warn("No human members found in this server.")
         
         embed = Embed(
             title=f"Humans",
-            description=members,
             color=config.Color.base
             )
         embed.set_author(
             name=ctx.author.name, 
             icon_url=ctx.author.display_avatar.url)
         
-        await ctx.paginate(
+        await paginate(
+            ctx,
             embed,
+            members,
+            lambda member: member.mention,
             text="member|members"
         )
     
@@ -2615,24 +2699,22 @@ class Information(Cog):
         View all the server invite code and their expiration date.
         """
         invites = await ctx.guild.invites()
-        invites_list = "\n".join(
-            f"[**{invite.code}**]({invite.url}) ({format_dt(invite.expires_at, style='R')})" if invite.expires_at else f"[**{invite.code}**]({invite.url}) (Never)"
-            for invite in invites
-        )
-        if not invites_list:
+        if not invites:
             return await ctx.warn("No active invites found in this server.")
         
         embed = Embed(
             title="Invites",
-            description=invites_list,
             color=config.Color.base
             )
         embed.set_author(
             name=ctx.author.name, 
             icon_url=ctx.author.display_avatar.url)
 
-        await ctx.paginate(
+        await paginate(
+            ctx,
             embed,
+            invites,
+            lambda invite: f"[**{invite.code}**]({invite.url}) ({format_dt(invite.expires_at, style='R') if invite.expires_at else 'Never'})",
             text="invite|invites"
         )
             
@@ -3,6 +3,9 @@ import re
 import os
 import asyncio
 import io
+import logging
+from collections import defaultdict
+from contextlib import suppress
 from datetime import datetime, timezone, timedelta
 from typing import (
     Optional,
@@ -19,7 +22,7 @@ import discord
 import aiosqlite
 from discord.ext import commands, tasks
 from discord.ui import View, Button
-from discord.utils import utcnow, format_dt
+from discord.utils import utcnow, format_dt, get
 from discord.abc import GuildChannel
 from discord import (
     app_commands,
@@ -65,17 +68,78 @@ from helpers.tools.utilities import (
     regex
     )
 
+from .services import (
+    AutoResponder,
+    BulkExecutor,
+    ExpiryScheduler,
+    GuildConfigCache,
+    MessageContext,
+    MessagePipeline,
+    StickyMessages,
+    Storage,
+    TimeoutIndex,
+    UserResolver,
+    message_progress,
+    paginate
+    )
+
+log = logging.getLogger(__name__)
+
 class Moderation(Cog):
+    # Guilds swept in parallel; each guild's role edits share one rate-limit route.
+    sweep_concurrency = 4
+    sweep_batch_size = 50
+    sweep_page_size = 500
+    # Seconds before an expiry that failed on Discord's side is attempted again.
+    expiry_retry_delay = 300
+    config_cache_size = 1024
+    overwrite_concurrency = 4
+    overwrite_max_concurrency = 16
+    # Autoresponders are answered here; the bot must not also run a listener of its own for them.
+    autoresponder_engine = True
+    # Sticky messages are re-posted by the bot's own listener; turn this on only once that one is removed.
+    sticky_engine = False
+    sticky_quiet = 3.0
+    sticky_max_wait = 30.0
+    
     def __init__(self, bot):
         self.bot = bot
+        self.expiry = ExpiryScheduler(self.on_expiry)
+        self.sweep_semaphore = asyncio.Semaphore(self.sweep_concurrency)
+        self.expiry_loader: Optional[asyncio.Task] = None
     
-    def cog_load(self):
-        self.check_jail_duration.start()
-        self.tempban_check.start()
+    async def cog_load(self):
+        self.storage = await Storage.attach(self.bot)
+        self.configs = GuildConfigCache.attach(self.bot, self.storage, maxsize=self.config_cache_size)
+        self.users = UserResolver.attach(self.bot)
+        self.timeouts = TimeoutIndex.attach(self.bot)
+        self.stickies = StickyMessages(
+            self.bot,
+            self.storage,
+            self.configs,
+            self.post_sticky,
+            quiet=self.sticky_quiet,
+            max_wait=self.sticky_max_wait
+        )
+        await self.stickies.load()
+        self.pipeline = await MessagePipeline.attach(self.bot)
+        if self.autoresponder_engine:
+            self.pipeline.register("autoresponder", self.autoresponder_check, priority=150)
+        
+        if self.sticky_engine:
+            self.pipeline.register("stickymessage", self.stickymessage_check, priority=200)
+        self.expiry.start()
+        self.expiry_loader = asyncio.create_task(self.load_expiries())
     
-    def cog_unload(self):
-        self.check_jail_duration.cancel()
-        self.tempban_check.cancel()
+    async def cog_unload(self):
+        self.pipeline.unregister("autoresponder")
+        self.pipeline.unregister("stickymessage")
+        self.stickies.stop()
+        self.expiry.stop()
+        if self.expiry_loader:
+            self.expiry_loader.cancel()
+        
+        await Storage.release(self.bot)
     
     @group(
         name="invoke",
@@ -554,21 +618,22 @@ class Moderation(Cog):
         """
         List all the ongoing timeouts.
         """
-        now = datetime.now(timezone.utc)
-        active_timeouts = [
-            member for member in ctx.guild.members 
-            if member.timed_out_until and member.timed_out_until > now
-        ]
+        active_timeouts = self.timeouts.active(ctx.guild)
         
         if not active_timeouts:
             return await ctx.warn("There are **no** active timeouts found")
         
         embed = Embed(
             color=config.Color.base,
-            title="Timeouts",
-            description="\n".join(f"{member.mention} ends <t:{int(member.timed_out_until.timestamp())}:R>" for member in active_timeouts))
+            title="Timeouts")
             
-        await ctx.paginate(embed)
+        # Captured now, a timeout can end or be lifted while the pages are open.
+        await paginate(
+            ctx,
+            embed,
+            [(member, member.timed_out_until) for member in active_timeouts],
+            lambda row: f"{row[0].mention} ends <t:{int(row[1].timestamp())}:R>"
+        )
     
     @command(
         name="banned",
@@ -586,20 +651,28 @@ class Moderation(Cog):
         """
         View all the banned users in the server.
         """
-        bans = []
         await ctx.defer()
-        async for ban in ctx.guild.bans():
-            bans.append((ban.user, ban.reason))
-
-        if not bans:
+        bans = ctx.guild.bans()
+        try:
+            first = await bans.__anext__()
+        except StopAsyncIteration:
             return await ctx.warn("There are no banned users in this server")
 
+        async def entries():
+            yield first
+            async for ban in bans:
+                yield ban
+
         embed = Embed(
             color=config.Color.base,
-            title="Banned",
-            description="\n".join(f"{user.mention or 'Unknown User'} - **{reason}**" for user, reason in bans))
+            title="Banned")
             
-        await ctx.paginate(embed)
+        await paginate(
+            ctx,
+            embed,
+            entries(),
+            lambda ban: f"{ban.user.mention or 'Unknown User'} - **{ban.reason}**"
+        )
     
     @command(
         name="unmuteall"
@@ -616,15 +689,14 @@ class Moderation(Cog):
         """
         await ctx.prompt("Are you sure you want to remove all the timed out members?")
         
-        await ctx.defer()
-        timed_out = tuple(member for member in ctx.guild.members if member.timed_out_until is not None and (ctx.guild.roles.index(member.top_role) < ctx.guild.roles.index(ctx.me.top_role) if member.top_role else True))
-            
-        await asyncio.gather(*(
-            member.timeout(None)
-            for member in timed_out
-        ))
+        timed_out = tuple(member for member in self.timeouts.active(ctx.guild) if member.top_role < ctx.me.top_role)
+        
+        msg = await ctx.loading(f"Removing **{len(timed_out):,}** timeouts")
+        result = await BulkExecutor(
+            progress=message_progress(msg, "Removing timeouts ({done:,}/{total:,})")
+        ).run(timed_out, lambda member: member.timeout(None, reason=f"Unmute all by {ctx.author}"))
         
-        return await ctx.approve(f"Successfully removed **{len(timed_out)}** timeouts")
+        return await ctx.approve(result.summary("removed", "timeouts"), previous_message=msg)
     
     @command(
         name="deleteinvites",
@@ -648,9 +720,12 @@ class Moderation(Cog):
         if not invites:
             return await ctx.warn("There aren't any invites in this server.")
         
-        await ctx.defer()
-        await asyncio.gather(*(invite.delete() for invite in invites))
-        return await ctx.approve("Successfully **deleted** every invite links in this server")
+        msg = await ctx.loading(f"Deleting **{len(invites):,}** invite links")
+        result = await BulkExecutor(
+            progress=message_progress(msg, "Deleting invite links ({done:,}/{total:,})")
+        ).run(invites, lambda invite: invite.delete(reason=f"Invites cleared by {ctx.author}"))
+        
+        return await ctx.approve(result.summary("deleted", "invite links"), previous_message=msg)
 
     @command(
         name="hardban", 
@@ -674,28 +749,25 @@ class Moderation(Cog):
         if user.premium_since:
             await ctx.prompt(f"Are you sure you want to **{act}** {user.mention}?\nThey are currently boosting the server!")
             
-        async with self.bot.db.cursor() as cursor:
-            await cursor.execute(
-                """
-                SELECT *
-                FROM hardbanned
-                WHERE guild_id = ?
-                AND user_id = ?
-                """,
-                (ctx.guild.id, user.id)
-            )
-            result = await cursor.fetchone()
-            if result:
-                return await ctx.warn(f"{user.mention} is **already** hardbanned")
-                
-            await cursor.execute(
-                """
-                INSERT OR REPLACE INTO hardbanned (guild_id, user_id, reason)
-                VALUES (?, ?, ?)
-                """,
-                (ctx.guild.id, user.id, reason)
-            )
-            await self.bot.db.commit()
+        result = await self.storage.fetchone(
+            """
+            SELECT *
+            FROM hardbanned
+            WHERE guild_id = ?
+            AND user_id = ?
+            """,
+            (ctx.guild.id, user.id)
+        )
+        if result:
+            return await ctx.warn(f"{user.mention} is **already** hardbanned")
+            
+        await self.storage.execute(
+            """
+            INSERT OR REPLACE INTO hardbanned (guild_id, user_id, reason)
+            VALUES (?, ?, ?)
+            """,
+            (ctx.guild.id, user.id, reason)
+        )
         
         with suppress(HTTPException):
             await ctx.guild.ban(user, reason=reason)
@@ -720,29 +792,26 @@ class Moderation(Cog):
         """
         Remove a user from the hardban.
         """
-        async with self.bot.db.cursor() as cursor:
-            await cursor.execute(
-                """
-                SELECT *
-                FROM hardbanned
-                WHERE guild_id = ?
-                AND user_id = ?
-                """,
-                (ctx.guild.id, user.id)
-            )
-            result = await cursor.fetchone()
-            if not result:
-                return await ctx.warn(f"{user.mention} is **not** hardbanned")
-            
-            await cursor.execute(
-                """
-                DELETE FROM hardbanned
-                WHERE guild_id = ? 
-                AND user_id = ?
-                """,
-                (ctx.guild.id, user.id)
-            )
-            await self.bot.db.commit()
+        result = await self.storage.fetchone(
+            """
+            SELECT *
+            FROM hardbanned
+            WHERE guild_id = ?
+            AND user_id = ?
+            """,
+            (ctx.guild.id, user.id)
+        )
+        if not result:
+            return await ctx.warn(f"{user.mention} is **not** hardbanned")
+        
+        await self.storage.execute(
+            """
+            DELETE FROM hardbanned
+            WHERE guild_id = ? 
+            AND user_id = ?
+            """,
+            (ctx.guild.id, user.id)
+        )
         
         with suppress(NotFound, HTTPException):
             await ctx.guild.unban(user, reason=reason)
@@ -762,22 +831,22 @@ class Moderation(Cog):
         """
         List all the hardbanned users.
         """
-        async with self.bot.db.cursor() as cursor:
-            await cursor.execute(
-                """
-                SELECT user_id, reason
-                FROM hardbanned
-                WHERE guild_id = ?
-                """,
-                (ctx.guild.id,)
-            )
-            results = await cursor.fetchall()
-            if not results:
-                return await ctx.warn("No users are currently hardbanned")
+        results = await self.storage.fetchall(
+            """
+            SELECT user_id, reason
+            FROM hardbanned
+            WHERE guild_id = ?
+            """,
+            (ctx.guild.id,)
+        )
+        if not results:
+            return await ctx.warn("No users are currently hardbanned")
+        
+        resolved = await self.users.resolve_many(user_id for user_id, _ in results)
         
         users = []
         for user_id, reason in results:
-            user = self.bot.get_get_user(user_id) or await self.bot.fetch_user(user_id)
+            user = resolved[user_id]
             if user:
                 users.append(f"**{user.name}** (`{user.id}`) **{reason}**")
             else:
@@ -821,22 +890,22 @@ class Moderation(Cog):
         
         end_time = datetime.utcnow() + delta
         end_time_str = end_time.isoformat()
+        expires_at = int(end_time.replace(tzinfo=timezone.utc).timestamp())
 
 
         await ctx.guild.ban(member, reason=reason, delete_message_days=delete_days)
         
-        async with self.bot.db.cursor() as cursor:
-            await cursor.execute(
-                """
-                INSERT INTO tempban (guild_id, user_id, duration)
-                VALUES (?, ?, ?)
-                """,
-                (ctx.guild.id, member.id, end_time_str)
-            )
-            await self.bot.db.commit()
+        await self.storage.execute(
+            """
+            INSERT INTO tempban (guild_id, user_id, duration, expires_at)
+            VALUES (?, ?, ?, ?)
+            """,
+            (ctx.guild.id, member.id, end_time_str, expires_at)
+        )
         
+        self.expiry.schedule(("tempban", ctx.guild.id, member.id), expires_at)
         if not await Invoke(ctx).send(member, reason):
-            await ctx.approve(f"Tempbanned {member.mention} ({human_timedelta(end_time)}) for the following reason: **{reason}**\nEnds in <t:{int(end_time.timestamp())}:R>")
+            await ctx.approve(f"Tempbanned {member.mention} ({human_timedelta(end_time)}) for the following reason: **{reason}**\nEnds in <t:{expires_at}:R>")
     
     @command(
         name="tempbanned"
@@ -851,25 +920,25 @@ class Moderation(Cog):
         """
         View a list of all the tempbanned members.
         """
-        async with self.bot.db.cursor() as cursor:
-            await cursor.execute(
-                """
-                SELECT user_id, duration
-                FROM tempban
-                WHERE guild_id = ?
-                """,
-                (ctx.guild.id,)
-            )
-            results = await cursor.fetchall()
-            if not results:
-                return await ctx.warn("There are no members are currently tempbanned")
+        results = await self.storage.fetchall(
+            """
+            SELECT user_id, expires_at
+            FROM tempban
+            WHERE guild_id = ?
+            ORDER BY expires_at
+            """,
+            (ctx.guild.id,)
+        )
+        if not results:
+            return await ctx.warn("There are no members are currently tempbanned")
+        
+        resolved = await self.users.resolve_many(user_id for user_id, _ in results)
         
         users = []
-        for user_id, duration in results:
-            user = self.bot.get_user(user_id) or await self.bot.fetch_user(user_id)
-            time = datetime.fromisoformat(duration)
+        for user_id, expires_at in results:
+            user = resolved[user_id]
             if user:
-                users.append(f"**{user.name}** (`{user.id}`) ends <t:{int(time.timestamp())}:R>")
+                users.append(f"**{user.name}** (`{user.id}`) ends <t:{expires_at}:R>")
             else:
                 users.append(f"**Unknown User** (`{user_id}`)")
         
@@ -927,22 +996,24 @@ class Moderation(Cog):
             delete_trigger = "delete" in params
             reply = "reply" in params
 
-            async with self.bot.db.cursor() as cursor:
-                await cursor.execute(
-                    """
-                    INSERT OR REPLACE INTO autoresponder (guild_id, trigger, response, not_strict, delete_trigger, reply) 
-                    VALUES (?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        ctx.guild.id,
-                        trigger.lower(),
-                        response,
-                        not_strict,
-                        delete_trigger,
-                        reply
-                    )
+            await self.storage.execute(
+                """
+                INSERT OR REPLACE INTO autoresponder (guild_id, trigger, response, not_strict, delete_trigger, reply) 
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    ctx.guild.id,
+                    trigger.lower(),
+                    response,
+                    not_strict,
+                    delete_trigger,
+                    reply
                 )
-                await self.bot.db.commit()
+            )
+            guild_config = self.configs.edit(ctx.guild.id)
+            if guild_config:
+                guild_config.autoresponders[trigger.lower()] = AutoResponder(trigger.lower(), response, not_strict, delete_trigger, reply)
+                guild_config.autoresponders_changed()
 
             param_list = []
             if not_strict:
@@ -977,21 +1048,22 @@ class Moderation(Cog):
         """
         Remove an autoresponder trigger.
         """
-        async with self.bot.db.cursor() as cursor:
-            await cursor.execute(
-                """
-                DELETE FROM autoresponder
-                WHERE guild_id = ?
-                AND trigger = ?
-                """,
-                (ctx.guild.id, trigger.lower())
-            )
-            await self.bot.db.commit()
-
-            if cursor.rowcount > 0:
-                await ctx.approve(f"Removed autoresponder trigger **{trigger}**")
-            else:
-                await ctx.warn(f"No autoresponder found with trigger **{trigger}**")
+        removed = await self.storage.execute(
+            """
+            DELETE FROM autoresponder
+            WHERE guild_id = ?
+            AND trigger = ?
+            """,
+            (ctx.guild.id, trigger.lower())
+        )
+        guild_config = self.configs.edit(ctx.guild.id)
+        if guild_config and guild_config.autoresponders.pop(trigger.lower(), None):
+            guild_config.autoresponders_changed()
+
+        if removed > 0:
+            await ctx.approve(f"Removed autoresponder trigger **{trigger}**")
+        else:
+            await ctx.warn(f"No autoresponder found with trigger **{trigger}**")
 
     @autoresponder.command(
         name="list"
@@ -1004,33 +1076,26 @@ class Moderation(Cog):
         """
         List all autoresponders trigger in the server.
         """
-        async with self.bot.db.cursor() as cursor:
-            await cursor.execute(
-                """
-                SELECT trigger, not_strict, delete_trigger, reply 
-                FROM autoresponder
-                WHERE guild_id = ? 
-                """,
-                (ctx.guild.id,)
-            )
-            results = await cursor.fetchall()
-            if not results:
-                return await ctx.warn("No autoresponders found for this server!")
+        guild_config = await self.configs.get(ctx.guild.id)
+        if not guild_config.autoresponders:
+            return await ctx.warn("No autoresponders found for this server!")
         
-        params = []
-        for trigger, not_strict, delete_trigger, reply in results:
-            if not_strict:
+        lines = []
+        for autoresponder in guild_config.autoresponders.values():
+            params = []
+            if autoresponder.not_strict:
                 params.append("`--not_strict`")
-            if delete_trigger:
+            if autoresponder.delete_trigger:
                 params.append("`--delete`")
-            if reply:
+            if autoresponder.reply:
                 params.append("`--reply`")
+            
+            lines.append(f"**{autoresponder.trigger}** {', '.join(params)}")
         
-        params_results = ", ".join(params) if params else ""
         embed = Embed(
             color=config.Color.base,
             title="Autoresponders",
-            description="\n".join(f"**{trigger}** {params_results}")
+            description="\n".join(lines)
             )
         embed.set_author(
             name=ctx.author.name,
@@ -1052,15 +1117,17 @@ class Moderation(Cog):
         """
         await ctx.prompt("Are you sure you want to **reset** all the autoresponder trigger for this server?")
         
-        async with self.bot.db.cursor() as cursor:
-            await cursor.execute(
-                """
-                DELETE FROM autoresponder
-                WHERE guild_id = ?
-                """,
-                (ctx.guild.id,)
-            )
-            await self.bot.db.commit()
+        await self.storage.execute(
+            """
+            DELETE FROM autoresponder
+            WHERE guild_id = ?
+            """,
+            (ctx.guild.id,)
+        )
+        guild_config = self.configs.edit(ctx.guild.id)
+        if guild_config:
+            guild_config.autoresponders.clear()
+            guild_config.autoresponders_changed()
         
         await ctx.approve("Reset all the autoresponder trigger in the server")
             
@@ -1082,21 +1149,12 @@ class Moderation(Cog):
         """
         View the raw response of an autoresponder trigger.
         """
-        async with self.bot.db.cursor() as cursor:
-            await cursor.execute(
-                """
-                SELECT response 
-                FROM autoresponder
-                WHERE guild_id = ? 
-                AND trigger = ?
-                """,
-                (ctx.guild.id, trigger.lower())
-            )
-            result = await cursor.fetchone()
-            if not result:
-                return await ctx.warn(f"No autoresponder found with trigger **{trigger}**")
+        guild_config = await self.configs.get(ctx.guild.id)
+        autoresponder = guild_config.autoresponders.get(trigger.lower())
+        if not autoresponder:
+            return await ctx.warn(f"No autoresponder found with trigger **{trigger}**")
 
-        response = result[0]
+        response = autoresponder.response
         await ctx.neutral(f"Current response for **{trigger}** trigger", code=f"```\n{response}\n```")
 
     @command(
@@ -1777,15 +1835,16 @@ class Moderation(Cog):
         """
         Toggle the no self-react system in the server.
         """
-        async with self.bot.db.cursor() as cursor:
-            await cursor.execute(
-                """
-                INSERT INTO noselfreact (guild_id, is_enabled)
-                VALUES (?, ?) ON CONFLICT(guild_id) DO UPDATE SET is_enabled = ?
-                """,
-                (ctx.guild.id, state, state)
-            )
-            await self.bot.db.commit()
+        await self.storage.execute(
+            """
+            INSERT INTO noselfreact (guild_id, is_enabled)
+            VALUES (?, ?) ON CONFLICT(guild_id) DO UPDATE SET is_enabled = ?
+            """,
+            (ctx.guild.id, state, state)
+        )
+        guild_config = self.configs.edit(ctx.guild.id)
+        if guild_config:
+            guild_config.noselfreact = state
         
         status = "enabled" if state else "disabled"
         await ctx.approve(f"Successfully **{status}** the no self-react")
@@ -1808,52 +1867,55 @@ class Moderation(Cog):
         """
         await ctx.defer()
         
-        async with self.bot.db.cursor() as cursor:
-            await cursor.execute(
-                """
-                SELECT *
-                FROM jail_config 
-                WHERE guild_id = ?
-                """,
-                (ctx.guild.id,)
-            )
-            if await cursor.fetchone():
-                return await ctx.warn("Jail is **already** configured in the server")
-            
-            msg = await ctx.loading("Configuring the jail system and creating the necessary role and channel")
-            
+        if (await self.configs.get(ctx.guild.id)).jail_configured:
+            return await ctx.warn("Jail is **already** configured in the server")
+        
+        msg = await ctx.loading("Configuring the jail system and creating the necessary role and channel")
+        
+        # A jail role left behind by an interrupted setup is reused, along with the channels it already hides.
+        jail_role = get(ctx.guild.roles, name=f"{self.bot.user.name}-jail")
+        if not jail_role or not jail_role.is_assignable():
             jail_role = await ctx.guild.create_role(
                 name=f"{self.bot.user.name}-jail",
                 color=Color.dark_grey(),
                 reason=f"{ctx.author} configured the jail system"
             )
-            
-            for channel in ctx.guild.channels:
-                try:
-                    await channel.set_permissions(jail_role, view_channel=False)
-                    await asyncio.sleep(3)
-                except:
-                    continue
-            
-            overwrites = {
-                jail_role: PermissionOverwrite(view_channel=True),
-                ctx.guild.default_role: PermissionOverwrite(view_channel=False)
-            }
-            
-            jail_channel = await ctx.guild.create_text_channel(
-                name="jail",
-                overwrites=overwrites,
-                reason=f"{ctx.author} configured the jail system"
-            )
-            
-            await cursor.execute(
-                """
-                INSERT INTO jail_config (guild_id, channel_id, role_id)
-                VALUES (?, ?, ?)
-                """, 
-                (ctx.guild.id, jail_channel.id, jail_role.id)
-            )
-            await self.bot.db.commit()
+        
+        # Overwrites are separate per-channel routes, so only the global limit is shared.
+        channels = [
+            channel for channel in ctx.guild.channels
+            if channel.overwrites_for(jail_role).view_channel is not False
+        ]
+        result = await BulkExecutor(
+            concurrency=self.overwrite_concurrency,
+            max_concurrency=self.overwrite_max_concurrency,
+            progress=message_progress(msg, "Hiding channels from the jail role ({done:,}/{total:,})")
+        ).run(channels, lambda channel: channel.set_permissions(jail_role, view_channel=False, reason=f"{ctx.author} configured the jail system"))
+        
+        overwrites = {
+            jail_role: PermissionOverwrite(view_channel=True),
+            ctx.guild.default_role: PermissionOverwrite(view_channel=False)
+        }
+        
+        jail_channel = await ctx.guild.create_text_channel(
+            name="jail",
+            overwrites=overwrites,
+            reason=f"{ctx.author} configured the jail system"
+        )
+        
+        await self.storage.execute(
+            """
+            INSERT INTO jail_config (guild_id, channel_id, role_id)
+            VALUES (?, ?, ?)
+            """, 
+            (ctx.guild.id, jail_channel.id, jail_role.id)
+        )
+        guild_config = self.configs.edit(ctx.guild.id)
+        if guild_config:
+            guild_config.jail_channel_id, guild_config.jail_role_id = jail_channel.id, jail_role.id
+        
+        if result.failed:
+            return await ctx.approve(f"Successfully configured the jail system, but **{len(result.failed):,}** channels could not be hidden from the jail role", previous_message=msg)
         
         await ctx.approve("Successfully configured the jail system!", previous_message=msg)
     
@@ -1872,52 +1934,47 @@ class Moderation(Cog):
         """
         Remove the jail system in the server.
         """
-        async with self.bot.db.cursor() as cursor:
-            await cursor.execute(
-                """
-                SELECT *
-                FROM jail_config 
-                WHERE guild_id = ?
-                """,
-                (ctx.guild.id,)
-            )
-            results = await cursor.fetchone()
-            if not results:
-                return await ctx.warn("Jail is **not** configured in the server")
-            
-            await ctx.prompt("Are you sure you want to **reset** the jail system?")
-            
-            role = ctx.guild.get_role(results[2])
-            channel = ctx.guild.get_channel(results[1])
+        guild_config = await self.configs.get(ctx.guild.id)
+        if not guild_config.jail_configured:
+            return await ctx.warn("Jail is **not** configured in the server")
+        
+        await ctx.prompt("Are you sure you want to **reset** the jail system?")
+        
+        role = ctx.guild.get_role(guild_config.jail_role_id)
+        channel = ctx.guild.get_channel(guild_config.jail_channel_id)
+        
+        if role:
+            try:
+                await role.delete(reason=f"{ctx.author} removed the jail system")
+            except:
+                pass
             
-            if role:
-                try:
-                    await role.delete(reason=f"{ctx.author} removed the jail system")
-                except:
-                    pass
-                
-            if channel:
-                try:
-                    await channel.delete(reason=f"{ctx.author} removed the jail system")
-                except:
-                    pass
-                
-            await cursor.execute(
+        if channel:
+            try:
+                await channel.delete(reason=f"{ctx.author} removed the jail system")
+            except:
+                pass
+        
+        async with self.storage.transaction() as tx:
+            await tx.execute(
                 """
                 DELETE FROM jail_config 
                 WHERE guild_id = ?
                 """,
                 (ctx.guild.id,)
             )
-            await cursor.execute(
+            await tx.execute(
                 """
                 DELETE FROM jailed_members
                 WHERE guild_id = ?
                 """,
                 (ctx.guild.id,)
             )
-            await self.bot.db.commit()
-                
+        guild_config = self.configs.edit(ctx.guild.id)
+        if guild_config:
+            guild_config.jail_channel_id = guild_config.jail_role_id = None
+        
+        self.expiry.cancel_where(lambda key: key[0] == "jail" and key[1] == ctx.guild.id)
         await ctx.approve("Successfully removed the jail system")
 
     @command(
@@ -1944,74 +2001,64 @@ class Moderation(Cog):
         if member.bot:
             return await ctx.warn("You cannot jail a bot.")
         
-        async with self.bot.db.cursor() as cursor:
-            await cursor.execute(
-                """
-                SELECT *
-                FROM jail_config 
-                WHERE guild_id = ?
-                """,
-                (ctx.guild.id,)
-            )
-            results = await cursor.fetchone()
-            if not results:
-                return await ctx.warn(f"Jail system is **not** configured, use `{ctx.clean_prefix}setjail` to set it then try this command again.")
-            
-            await cursor.execute(
+        guild_config = await self.configs.get(ctx.guild.id)
+        if not guild_config.jail_configured:
+            return await ctx.warn(f"Jail system is **not** configured, use `{ctx.clean_prefix}setjail` to set it then try this command again.")
+        
+        delta = humanize_duration(duration)
+        if not delta:
+            return await ctx.warn("Invalid duration format. Use a combination of `d`, `h`, `m`, and `s` (e.g., `3d5h20m7s`)")
+        
+        jail_time = int(datetime.now().timestamp())
+        duration_seconds = int(delta.total_seconds())
+        unix_time = int((utcnow() + delta).timestamp())
+        
+        roles = [role.id for role in member.roles if not role.is_default() and not role.managed]
+        jail_role = ctx.guild.get_role(guild_config.jail_role_id)
+        
+        if not jail_role:
+            return await ctx.warn("I couldn't find the jail role! Please reconfigure the jail system.")
+        
+        # Saved before the roles are stripped so they can always be restored, dropped again if the edit fails.
+        # The insert is also the "already jailed" check, so two concurrent jails cannot both go through.
+        inserted = await self.storage.execute(
+            """
+            INSERT INTO jailed_members (guild_id, user_id, roles, jail_timestamp, duration, expires_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (guild_id, user_id) DO NOTHING
+            """,
+            (ctx.guild.id, member.id, json.dumps(roles), jail_time, duration_seconds, jail_time + duration_seconds))
+        if not inserted:
+            return await ctx.warn(f"{member.mention} is **already** jailed!")
+        
+        try:
+            await member.edit(roles=[jail_role] + [role for role in member.roles if role.managed], reason=f"Jailed by {ctx.author} - {reason}")
+        except HTTPException:
+            await self.storage.execute(
                 """
-                SELECT *
-                FROM jailed_members
+                DELETE FROM jailed_members
                 WHERE guild_id = ?
                 AND user_id = ?
-                """, 
+                """,
                 (ctx.guild.id, member.id)
             )
-            jailed = await cursor.fetchone()
-            if jailed:
-                return await ctx.warn(f"{member.mention} is **already** jailed!")
-            
-            delta = humanize_duration(duration)
-            if not delta:
-                return await ctx.warn("Invalid duration format. Use a combination of `d`, `h`, `m`, and `s` (e.g., `3d5h20m7s`)")
-            
-            jail_time = int(datetime.now().timestamp())
-            duration_seconds = int(delta.total_seconds())
-            unix_time = int((utcnow() + delta).timestamp())
-            
-            roles = [role.id for role in member.roles if not role.is_default() and not role.managed]
-            jail_role = ctx.guild.get_role(results[2])
-            
-            if not jail_role:
-                return await ctx.warn("I couldn't find the jail role! Please reconfigure the jail system.")
-            
-            await cursor.execute(
-                """
-                INSERT INTO jailed_members (guild_id, user_id, roles, jail_timestamp, duration)
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                (ctx.guild.id, member.id, json.dumps(roles), jail_time, duration_seconds))
-            
-            try:
-                await member.edit(roles=[jail_role] + [role for role in member.roles if role.managed], reason=f"Jailed by {ctx.author} - {reason}")
-            except HTTPException:
-                await self.bot.db.rollback()
-                return await ctx.deny("Failed to strip all the member roles")
-            
-            await self.bot.db.commit()
-            
-            channel = ctx.guild.get_channel(results[1])
-            if channel:
-                e = Embed(
-                    color=config.Color.deny,
-                    description=f"You have been jailed by {ctx.author.mention} for the following reason: **{reason}**")
-                e.add_field(
-                    name="**Duration**",
-                    value=f"{human_timedelta(delta, suffix=False)} (<t:{unix_time}:R>)",
-                    inline=False)
-                e.set_author(
-                    name=f"{member.name} ({member.id})",
-                    icon_url=member.display_avatar.url)
-                await channel.send(content=member.mention, embed=e)
+            return await ctx.deny("Failed to strip all the member roles")
+        
+        self.expiry.schedule(("jail", ctx.guild.id, member.id), jail_time + duration_seconds)
+        
+        channel = ctx.guild.get_channel(guild_config.jail_channel_id)
+        if channel:
+            e = Embed(
+                color=config.Color.deny,
+                description=f"You have been jailed by {ctx.author.mention} for the following reason: **{reason}**")
+            e.add_field(
+                name="**Duration**",
+                value=f"{human_timedelta(delta, suffix=False)} (<t:{unix_time}:R>)",
+                inline=False)
+            e.set_author(
+                name=f"{member.name} ({member.id})",
+                icon_url=member.display_avatar.url)
+            await channel.send(content=member.mention, embed=e)
         
         if not await Invoke(ctx).send(member, reason):
             await ctx.approve(f"Jailed {member.mention} ({human_timedelta(delta, suffix=False)}) for the following reason: **{reason}**")
@@ -2035,61 +2082,51 @@ class Moderation(Cog):
         """
         await ctx.defer()
         
-        async with self.bot.db.cursor() as cursor:
-            await cursor.execute(
-                """
-                SELECT role_id 
-                FROM jail_config
-                WHERE guild_id = ?
-                """,
-                (ctx.guild.id,)
-            )
-            results = await cursor.fetchone()
-            if not results:
-                return await ctx.warn(f"Jail system is **not** configured, use `{ctx.clean_prefix}setjail` to set it then try this command again.")
-            
-            await cursor.execute(
-                """
-                SELECT roles 
-                FROM jailed_members
-                WHERE guild_id = ? 
-                AND user_id = ?
-                """, 
-                (ctx.guild.id, member.id)
-            )
-            jailed = await cursor.fetchone()
-            if not jailed:
-                return await ctx.warn(f"{member.mention} is **not** jailed!")
-            
-            jail_role = ctx.guild.get_role(results[0])
-            roles_to_restore = [ctx.guild.get_role(rid) for rid in json.loads(jailed[0]) if rid]
-            
-            try:
-                await member.remove_roles(jail_role, reason=f"Unjailed by {ctx.author}: {reason}")
-                await member.add_roles(*filter(None, roles_to_restore), reason="Restoring pre-jail roles")
-            except HTTPException:
-                return await ctx.deny("Failed to unjail member")
-            
-            await cursor.execute(
-                """
-                DELETE FROM jailed_members 
-                WHERE guild_id = ? AND user_id = ?
-                """, 
-                (ctx.guild.id, member.id)
+        guild_config = await self.configs.get(ctx.guild.id)
+        if not guild_config.jail_configured:
+            return await ctx.warn(f"Jail system is **not** configured, use `{ctx.clean_prefix}setjail` to set it then try this command again.")
+        
+        jailed = await self.storage.fetchone(
+            """
+            SELECT roles 
+            FROM jailed_members
+            WHERE guild_id = ? 
+            AND user_id = ?
+            """, 
+            (ctx.guild.id, member.id)
+        )
+        if not jailed:
+            return await ctx.warn(f"{member.mention} is **not** jailed!")
+        
+        jail_role = ctx.guild.get_role(guild_config.jail_role_id)
+        roles_to_restore = [ctx.guild.get_role(rid) for rid in json.loads(jailed[0]) if rid]
+        
+        try:
+            await member.remove_roles(jail_role, reason=f"Unjailed by {ctx.author}: {reason}")
+            await member.add_roles(*filter(None, roles_to_restore), reason="Restoring pre-jail roles")
+        except HTTPException:
+            return await ctx.deny("Failed to unjail member")
+        
+        await self.storage.execute(
+            """
+            DELETE FROM jailed_members 
+            WHERE guild_id = ? AND user_id = ?
+            """, 
+            (ctx.guild.id, member.id)
+        )
+        self.expiry.cancel(("jail", ctx.guild.id, member.id))
+        
+        try:
+            e = Embed(
+                color=config.Color.approve,
+                description=f"You have been unjailed by {ctx.author.mention} on **{ctx.guild.name}** for the following reason: **{reason}**"
             )
-            await self.bot.db.commit()
-            
-            try:
-                e = Embed(
-                    color=config.Color.approve,
-                    description=f"You have been unjailed by {ctx.author.mention} on **{ctx.guild.name}** for the following reason: **{reason}**"
-                )
-                e.set_author(
-                    name=ctx.guild.name,
-                    icon_url=ctx.guild.icon)
-                await member.send(embed=e)
-            except:
-                pass
+            e.set_author(
+                name=ctx.guild.name,
+                icon_url=ctx.guild.icon)
+            await member.send(embed=e)
+        except:
+            pass
         
         if not await Invoke(ctx).send(member, reason):
             await ctx.approve(f"Successfully unjailed {member.mention} - **{reason}**")
@@ -2135,28 +2172,21 @@ class Moderation(Cog):
         """
         channel = channel or ctx.channel
 
-        async with self.bot.db.cursor() as cursor:
-            await cursor.execute(
-                """
-                SELECT * 
-                FROM stickymessage 
-                WHERE guild_id = ?
-                AND channel_id = ?
-                """,
-                (ctx.guild.id, channel.id)
-            )
-            result = await cursor.fetchone()
-            if result:
-                return await ctx.warn(f"{channel.mention} is **already** have a **stickymessage** set, remove it first then try this command again.")
+        if channel.id in (await self.configs.get(ctx.guild.id)).stickymessages:
+            return await ctx.warn(f"{channel.mention} is **already** have a **stickymessage** set, remove it first then try this command again.")
 
-            await cursor.execute(
-                """
-                INSERT INTO stickymessage (guild_id, channel_id, message) 
-                VALUES (?, ?, ?)
-                """,
-                (ctx.guild.id, channel.id, code)
-            )
-            await self.bot.db.commit()
+        await self.storage.execute(
+            """
+            INSERT INTO stickymessage (guild_id, channel_id, message) 
+            VALUES (?, ?, ?)
+            """,
+            (ctx.guild.id, channel.id, code)
+        )
+        guild_config = self.configs.edit(ctx.guild.id)
+        if guild_config:
+            guild_config.stickymessages[channel.id] = code
+
+        self.stickies.add(ctx.guild.id, channel.id)
 
         await ctx.approve(f"Added a **stickymessage** for {channel.mention}")
 
@@ -2178,30 +2208,25 @@ class Moderation(Cog):
         """
         Remove a sticky message from a channel.
         """
-        async with self.bot.db.cursor() as cursor:
-            await cursor.execute(
-                """
-                SELECT *
-                FROM stickymessage
-                WHERE guild_id = ?
-                AND channel_id = ?
-                """
-                , 
-                (ctx.guild.id, channel.id)
-            )
-            result = await cursor.fetchone()
-            if not result:
-                return await ctx.warn(f"{channel.mention} does **not** have a **stickymessage**")
+        removed = await self.storage.execute(
+            """
+            DELETE FROM stickymessage
+            WHERE guild_id = ?
+            AND channel_id = ?
+            """,
+            (ctx.guild.id, channel.id)
+        )
+        guild_config = self.configs.edit(ctx.guild.id)
+        if guild_config:
+            guild_config.stickymessages.pop(channel.id, None)
+        
+        if not removed:
+            return await ctx.warn(f"{channel.mention} does **not** have a **stickymessage**")
 
-            await cursor.execute(
-                """
-                DELETE FROM stickymessage
-                WHERE guild_id = ?
-                AND channel_id = ?
-                """,
-                (ctx.guild.id, channel.id)
-            )
-            await self.bot.db.commit()
+        posted = self.stickies.forget(channel.id)
+        if posted:
+            with suppress(HTTPException):
+                await channel.get_partial_message(posted).delete()
 
         await ctx.approve(f"Removed a **stickymessage** from {channel.mention}")
 
@@ -2220,21 +2245,11 @@ class Moderation(Cog):
         """
         View the sticky message of a channel.
         """
-        async with self.bot.db.cursor() as cursor:
-            await cursor.execute(
-                """
-                SELECT message 
-                FROM stickymessage
-                WHERE guild_id = ?
-                AND channel_id = ?
-                """,
-                (ctx.guild.id, channel.id)
-            )
-            result = await cursor.fetchone()
-            if not result:
-                return await ctx.warn(f"{channel.mention} does **not** have a **stickymessage**")
+        guild_config = await self.configs.get(ctx.guild.id)
+        message = guild_config.stickymessages.get(channel.id)
+        if message is None:
+            return await ctx.warn(f"{channel.mention} does **not** have a **stickymessage**")
         
-        message = result[0]
         await ctx.neutral(f"Current stickymessage in {channel.mention}", code=message)
 
     @stickymessage.command(
@@ -2250,21 +2265,12 @@ class Moderation(Cog):
         """
         View a list of every existing sticky message in the server.
         """
-        async with self.bot.db.cursor() as cursor:
-            await cursor.execute(
-                """
-                SELECT channel_id
-                FROM stickymessage
-                WHERE guild_id = ?
-                """,
-                (ctx.guild.id,)
-            )
-            results = await cursor.fetchall()
-            if not results:
-                return await ctx.warn(f"This server doesn't have any **stickymessage** to show.")
+        guild_config = await self.configs.get(ctx.guild.id)
+        if not guild_config.stickymessages:
+            return await ctx.warn(f"This server doesn't have any **stickymessage** to show.")
 
         channels = []
-        for (channel_id,) in results:
+        for channel_id in guild_config.stickymessages:
             channel = ctx.guild.get_channel(channel_id)
             if channel:
                 channels.append(f"{channel.mention} (`{channel.id}`)")
@@ -2292,22 +2298,25 @@ class Moderation(Cog):
         """
         await ctx.prompt("Are you sure you want to **reset** all the stickymessage in the server?")
         
-        async with self.bot.db.cursor() as cursor:
-            await cursor.execute(
-                """
-                DELETE FROM stickymessage
-                WHERE guild_id = ?
-                """,
-                (ctx.guild.id,)
-            )
-            await self.bot.db.commit()
+        await self.storage.execute(
+            """
+            DELETE FROM stickymessage
+            WHERE guild_id = ?
+            """,
+            (ctx.guild.id,)
+        )
+        guild_config = self.configs.edit(ctx.guild.id)
+        if guild_config:
+            guild_config.stickymessages.clear()
+
+        self.stickies.reset(ctx.guild.id)
         
         await ctx.approve("Reset all the stickymessage in the server")
     
     @group(
         name="forcenickname",
         usage="(subcommand)",
-        example="list"
+        example="list",
         aliases=[
             "fn"
         ]
@@ -2325,111 +2334,257 @@ class Moderation(Cog):
     
     
 
-    @tasks.loop(minutes=1)
-    async def check_jail_duration(self):
-        async with self.bot.db.cursor() as cursor:
-            current_time = int(datetime.now().timestamp())
-            
-            await cursor.execute(
+    @Cog.listener("on_member_update")
+    async def timeouts_update(self, before: Member, after: Member):
+        if before.timed_out_until != after.timed_out_until:
+            self.timeouts.update(after)
+    
+    @Cog.listener("on_member_remove")
+    async def timeouts_remove(self, member: Member):
+        self.timeouts.remove(member)
+    
+    @Cog.listener("on_guild_remove")
+    async def timeouts_forget(self, guild: Guild):
+        self.timeouts.forget(guild)
+    
+    async def autoresponder_check(self, context: MessageContext):
+        message = context.message
+        if message.author.bot:
+            return
+        
+        guild_config = await context.config()
+        if not guild_config or not guild_config.autoresponders:
+            return
+        
+        autoresponder = guild_config.matcher.match(message.content)
+        if autoresponder is None:
+            return
+        
+        if autoresponder.delete_trigger:
+            with suppress(HTTPException):
+                await message.delete()
+        
+        await EmbedScript(autoresponder.response).send(
+            message.channel,
+            guild=message.guild,
+            channel=message.channel,
+            user=message.author,
+            reference=message if autoresponder.reply and not autoresponder.delete_trigger else None
+        )
+    
+    async def stickymessage_check(self, context: MessageContext):
+        message = context.message
+        if message.author != self.bot.user:
+            self.stickies.activity(message)
+    
+    async def post_sticky(self, channel: TextChannel, template: str, message: Message) -> Message:
+        """
+        Send the sticky script with the variables of the last message before the re-post.
+        """
+        return await EmbedScript(template).send(
+            channel,
+            guild=channel.guild,
+            channel=channel,
+            user=message.author
+        )
+    
+    async def load_expiries(self):
+        """
+        Load every pending jail and tempban deadline into the scheduler once.
+        """
+        await self.bot.wait_until_ready()
+        
+        for kind, table in (("jail", "jailed_members"), ("tempban", "tempban")):
+            rows = await self.storage.fetchall(
+                f"""
+                SELECT guild_id, user_id, MAX(expires_at, COALESCE(retry_at, 0))
+                FROM {table}
+                WHERE expires_at IS NOT NULL
+                ORDER BY expires_at
                 """
-                SELECT guild_id, user_id, roles 
-                FROM jailed_members 
-                WHERE jail_timestamp + duration <= ?
+            )
+            for guild_id, user_id, due_at in rows:
+                self.expiry.schedule((kind, guild_id, user_id), due_at)
+    
+    async def on_expiry(self, keys: List[Tuple[str, int, int]]):
+        """
+        Sweep every due row of the expired kinds, not just the keys that fired.
+        
+        Rows that failed with a retryable error carry a ``retry_at`` and are
+        skipped until it passes, everything else is settled by the sweep.
+        """
+        now = int(utcnow().timestamp())
+        for kind in {key[0] for key in keys}:
+            await self.sweep(kind, now)
+    
+    async def sweep(self, kind: str, now: int):
+        table = "jailed_members" if kind == "jail" else "tempban"
+        last = (0, 0, 0)
+        while True:
+            rows = await self.storage.fetchall(
+                f"""
+                SELECT expires_at, guild_id, user_id{", roles" if kind == "jail" else ""}
+                FROM {table}
+                WHERE expires_at <= ?
+                AND (expires_at, guild_id, user_id) > (?, ?, ?)
+                AND (retry_at IS NULL OR retry_at <= ?)
+                ORDER BY expires_at, guild_id, user_id
+                LIMIT ?
                 """,
-                (current_time,)
+                (now, *last, now, self.sweep_page_size)
             )
-            jailed = await cursor.fetchall()
-            for guild_id, user_id, roles in jailed:
-                guild = self.bot.get_guild(guild_id)
-                user = self.bot.get_user(user_id) or await self.bot.fetch_user(user_id)
-                if not guild:
-                    continue
-                
-                member = guild.get_member(user_id) or await guild.fetch_member(user_id)
-                if not member:
-                    continue
-                
-                await cursor.execute(
-                    """
-                    SELECT *
-                    FROM jail_config 
-                    WHERE guild_id = ?
-                    """,
-                    (guild.id,)
-                )
-                result = await cursor.fetchone()
-                if not result:
-                    continue
-                
-                jail_role = guild.get_role(result[2])
-                if not jail_role:
-                    continue
-                
-                roles_to_restore = [guild.get_role(rid) for rid in json.loads(roles) if rid]
-                
+            
+            if not rows:
+                return
+            
+            batches: Dict[int, List[tuple]] = defaultdict(list)
+            for expires_at, guild_id, *row in rows:
+                batches[guild_id].append(tuple(row))
+            
+            await asyncio.gather(*(
+                self.sweep_guild(kind, guild_id, batch)
+                for guild_id, batch in batches.items()
+            ))
+            
+            if len(rows) < self.sweep_page_size:
+                return
+            
+            last = tuple(rows[-1][:3])
+    
+    async def sweep_guild(self, kind: str, guild_id: int, rows: List[tuple]):
+        async with self.sweep_semaphore:
+            for index in range(0, len(rows), self.sweep_batch_size):
+                batch = rows[index:index + self.sweep_batch_size]
                 try:
+                    if kind == "jail":
+                        await self.expire_jails(guild_id, batch)
+                    elif kind == "tempban":
+                        await self.expire_tempbans(guild_id, [user_id for (user_id,) in batch])
+                except Exception:
+                    log.exception("Failed to expire %s batch in guild %s", kind, guild_id)
+    
+    async def retry_expiry(self, kind: str, guild_id: int, user_ids: List[int]):
+        """
+        Push back rows that failed with a retryable error by ``expiry_retry_delay``.
+        """
+        if not user_ids:
+            return
+        
+        table = "jailed_members" if kind == "jail" else "tempban"
+        retry_at = int(utcnow().timestamp()) + self.expiry_retry_delay
+        await self.storage.executemany(
+            f"""
+            UPDATE {table}
+            SET retry_at = ?
+            WHERE guild_id = ?
+            AND user_id = ?
+            """,
+            [(retry_at, guild_id, user_id) for user_id in user_ids]
+        )
+        for user_id in user_ids:
+            self.expiry.schedule((kind, guild_id, user_id), retry_at)
+    
+    async def drop_expiries(self, kind: str, guild_id: int, user_ids: List[int]):
+        table = "jailed_members" if kind == "jail" else "tempban"
+        await self.storage.executemany(
+            f"""
+            DELETE FROM {table}
+            WHERE guild_id = ?
+            AND user_id = ?
+            """,
+            [(guild_id, user_id) for user_id in user_ids]
+        )
+    
+    async def expire_jails(self, guild_id: int, jailed: List[Tuple[int, str]]):
+        guild = self.bot.get_guild(guild_id)
+        if guild and guild.unavailable:
+            await self.retry_expiry("jail", guild_id, [user_id for user_id, _ in jailed])
+            return
+        
+        if not guild:
+            log.warning("Dropping %d expired jails for guild %s, the bot is no longer in it", len(jailed), guild_id)
+            await self.drop_expiries("jail", guild_id, [user_id for user_id, _ in jailed])
+            return
+        
+        guild_config = await self.configs.get(guild_id)
+        # Without the jail role there is nothing to remove, previous roles are still restored.
+        jail_role = guild.get_role(guild_config.jail_role_id) if guild_config.jail_configured else None
+        
+        released, unjailed, retry = [], [], []
+        for user_id, roles in jailed:
+            try:
+                member = guild.get_member(user_id) or await guild.fetch_member(user_id)
+            except (NotFound, Forbidden):
+                released.append(user_id)
+                continue
+            except HTTPException:
+                retry.append(user_id)
+                continue
+            
+            roles_to_restore = [guild.get_role(rid) for rid in json.loads(roles) if rid]
+            try:
+                if jail_role:
                     await member.remove_roles(jail_role, reason="Automatically unjailed as the duration has expired")
-                    await member.add_roles(*filter(None, roles_to_restore), reason=f"Restoring previous {member.name} roles")
-                except HTTPException:
-                    continue
-                
-                await cursor.execute(
-                    """
-                    DELETE FROM jailed_members 
-                    WHERE guild_id = ? 
-                    AND user_id = ?
-                    """,
-                    (guild.id, user.id)
-                )
-                try:
-                    e = Embed(
-                        color=config.Color.approve,
-                        description=f"You have been unjailed on **{guild.name}** as the duration has expired"
-                    )
-                    e.set_author(
-                        name=guild.name,
-                        icon_url=guild.icon)
-                    await member.send(embed=e)
-                except Forbidden:
-                    pass
                 
-            await self.bot.db.commit()
+                await member.add_roles(*filter(None, roles_to_restore), reason=f"Restoring previous {member.name} roles")
+            except Forbidden:
+                log.warning("Missing permissions to unjail %s in guild %s, dropping the jail", user_id, guild_id)
+                released.append(user_id)
+                continue
+            except HTTPException:
+                retry.append(user_id)
+                continue
+            
+            released.append(user_id)
+            unjailed.append(member)
+        
+        await self.retry_expiry("jail", guild_id, retry)
+        if not released:
+            return
+        
+        await self.drop_expiries("jail", guild_id, released)
+        
+        e = Embed(
+            color=config.Color.approve,
+            description=f"You have been unjailed on **{guild.name}** as the duration has expired"
+        )
+        e.set_author(
+            name=guild.name,
+            icon_url=guild.icon)
+        await asyncio.gather(
+            *(member.send(embed=e) for member in unjailed),
+            return_exceptions=True
+        )
     
-    @tasks.loop(minutes=1)
-    async def tempban_check(self):
-        current_time = datetime.utcnow()
-        async with self.bot.db.cursor() as cursor:
-            await cursor.execute(
-                """
-                SELECT guild_id, user_id, duration
-                FROM tempban
-                """
-            )
-            results = await cursor.fetchall()
-
-            for guild_id, user_id, duration in results:
-                end_time = datetime.fromisoformat(duration)
-                if end_time <= current_time:
-                    guild = self.bot.get_guild(guild_id)
-                    user = self.bot.get_user(user_id) or await self.bot.fetch_user(user_id)
-                    if guild:
-                        try:
-                            await guild.unban(user, reason="Temporary ban")
-                        except NotFound:
-                            pass
-                        except Exception as e:
-                            print(f"Tempban error in {guild.name} ({guild.id}) for {user.name} ({user.id})\n{str(e)}")
-
-                    await cursor.execute(
-                        """
-                        DELETE FROM tempban 
-                        WHERE guild_id = ? 
-                        AND user_id = ?
-                        """,
-                        (guild.id, user.id)
-                    )
+    async def expire_tempbans(self, guild_id: int, user_ids: List[int]):
+        guild = self.bot.get_guild(guild_id)
+        if guild and guild.unavailable:
+            await self.retry_expiry("tempban", guild_id, user_ids)
+            return
+        
+        if not guild:
+            log.warning("Dropping %d expired tempbans for guild %s, the bot is no longer in it", len(user_ids), guild_id)
+            await self.drop_expiries("tempban", guild_id, user_ids)
+            return
+        
+        unbanned, retry = [], []
+        for user_id in user_ids:
+            try:
+                await guild.unban(Object(id=user_id), reason="Temporary ban")
+            except NotFound:
+                pass
+            except Forbidden:
+                log.warning("Missing permissions to lift tempban in guild %s for %s, dropping it", guild_id, user_id)
+            except HTTPException:
+                log.exception("Failed to lift tempban in guild %s for %s", guild_id, user_id)
+                retry.append(user_id)
+                continue
             
-            await self.bot.db.commit()
+            unbanned.append(user_id)
+        
+        await self.retry_expiry("tempban", guild_id, retry)
+        if unbanned:
+            await self.drop_expiries("tempban", guild_id, unbanned)
 
 async def setup(bot) -> None:
     await bot.add_cog(Moderation(bot))
\ No newline at end of file
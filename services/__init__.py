@@ -0,0 +1,57 @@
+from .autoresponders import AutoResponderMatcher
+from .bulk import BulkExecutor, BulkResult, message_progress
+from .expiry import ExpiryScheduler
+from .forcenick import ForceNicknames
+from .forwarder import WebhookForwarder
+from .guildconfig import AutoResponder, GuildConfig, GuildConfigCache
+from .guildstats import GuildStats, GuildStatsTracker
+from .joinorder import JoinOrder
+from .metrics import MetricsSampler, Sample
+from .paginator import Paginator, paginate
+from .pipeline import MessageContext, MessagePipeline
+from .responses import ResponseCache, dump_embeds, load_embeds
+from .search import FanoutSearch, SourceStats
+from .selfaliases import SelfAliasIndex
+from .shards import ShardStats
+from .speak import SpeakRoutes
+from .sticky import StickyMessages
+from .storage import Storage, Transaction
+from .timeouts import TimeoutIndex
+from .users import UserResolver
+from .writebehind import WriteBehind
+
+__all__ = (
+    "AutoResponder",
+    "AutoResponderMatcher",
+    "BulkExecutor",
+    "BulkResult",
+    "ExpiryScheduler",
+    "FanoutSearch",
+    "ForceNicknames",
+    "GuildConfig",
+    "GuildConfigCache",
+    "GuildStats",
+    "GuildStatsTracker",
+    "JoinOrder",
+    "MessageContext",
+    "MessagePipeline",
+    "MetricsSampler",
+    "Paginator",
+    "ResponseCache",
+    "Sample",
+    "SelfAliasIndex",
+    "ShardStats",
+    "SourceStats",
+    "SpeakRoutes",
+    "StickyMessages",
+    "Storage",
+    "TimeoutIndex",
+    "Transaction",
+    "UserResolver",
+    "WebhookForwarder",
+    "WriteBehind",
+    "dump_embeds",
+    "load_embeds",
+    "message_progress",
+    "paginate",
+)
@@ -0,0 +1,79 @@
+"""
+Compare the compiled autoresponder matcher with a loop over every trigger.
+
+    python services/autoresponder_bench.py [triggers] [messages]
+
+Builds ``triggers`` random triggers (1,000 by default, a quarter strict) and
+times both matchers over ``messages`` random chat-sized messages, checking
+that they agree on whether each message triggers anything.
+"""
+import random
+import string
+import sys
+from pathlib import Path
+from time import perf_counter
+from types import SimpleNamespace
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from autoresponders import AutoResponderMatcher  # noqa: E402
+
+WORDS = ["".join(random.choices(string.ascii_lowercase, k=random.randint(3, 8))) for _ in range(5000)]
+
+
+def phrase(low: int, high: int) -> str:
+    return " ".join(random.choices(WORDS, k=random.randint(low, high)))
+
+
+def naive(
+    autoresponders: List[SimpleNamespace],
+    content: str
+):
+    content = content.strip().lower()
+    for autoresponder in autoresponders:
+        if autoresponder.not_strict:
+            if autoresponder.trigger in content:
+                return autoresponder
+        elif autoresponder.trigger == content:
+            return autoresponder
+
+    return None
+
+
+def main(argv: List[str]) -> int:
+    triggers = int(argv[0]) if argv else 1000
+    messages = int(argv[1]) if len(argv) > 1 else 10000
+    random.seed(0)
+
+    autoresponders = [
+        SimpleNamespace(trigger=phrase(1, 3), not_strict=index % 4 != 0)
+        for index in range(triggers)
+    ]
+    corpus = [phrase(5, 30) for _ in range(messages)]
+    corpus[::50] = [f"{phrase(2, 5)} {autoresponder.trigger} {phrase(2, 5)}" for autoresponder in random.choices(autoresponders, k=len(corpus[::50]))]
+
+    started = perf_counter()
+    matcher = AutoResponderMatcher(autoresponders)
+    matcher.match("")
+    built = perf_counter() - started
+
+    started = perf_counter()
+    compiled = [matcher.match(content) for content in corpus]
+    compiled_time = perf_counter() - started
+
+    started = perf_counter()
+    looped = [naive(autoresponders, content) for content in corpus]
+    looped_time = perf_counter() - started
+
+    mismatches = sum((a is None) != (b is None) for a, b in zip(compiled, looped))
+    print(f"{triggers:,} triggers, {messages:,} messages, {sum(a is not None for a in compiled):,} matched")
+    print(f"build     {built * 1000:9.2f} ms")
+    print(f"compiled  {compiled_time * 1000:9.2f} ms  {compiled_time / messages * 1e6:7.2f} us/message")
+    print(f"naive     {looped_time * 1000:9.2f} ms  {looped_time / messages * 1e6:7.2f} us/message")
+    print(f"speedup   {looped_time / compiled_time:9.1f}x")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,101 @@
+from collections import deque
+from typing import (
+    Dict,
+    Iterable,
+    List,
+    Optional
+    )
+
+
+class AutoResponderMatcher:
+    """
+    One guild's autoresponder triggers compiled for a single pass per message.
+
+    Strict triggers must equal the whole (stripped, lowercased) message and
+    are looked up in a dict. ``not_strict`` triggers may appear anywhere in
+    the message and are matched by an Aho-Corasick automaton, built the
+    first time a message needs it. When several substring triggers match,
+    the one that ends first wins, the longest of those on a tie.
+    """
+
+    def __init__(
+        self,
+        autoresponders: Iterable
+    ):
+        self.strict: Dict[str, object] = {}
+        self.substring: Dict[str, object] = {}
+        for autoresponder in autoresponders:
+            if autoresponder.not_strict:
+                self.substring[autoresponder.trigger] = autoresponder
+            else:
+                self.strict[autoresponder.trigger] = autoresponder
+
+        self._goto: Optional[List[Dict[str, int]]] = None
+        self._fail: List[int] = []
+        self._output: List[Optional[str]] = []
+
+    def __len__(self) -> int:
+        return len(self.strict) + len(self.substring)
+
+    def match(
+        self,
+        content: str
+    ):
+        """
+        Return the autoresponder triggered by ``content``, if any.
+        """
+        content = content.strip().lower()
+        autoresponder = self.strict.get(content)
+        if autoresponder is not None or not self.substring:
+            return autoresponder
+
+        if self._goto is None:
+            self._build()
+
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for character in content:
+            while state and character not in goto[state]:
+                state = fail[state]
+
+            state = goto[state].get(character, 0)
+            if output[state] is not None:
+                return self.substring[output[state]]
+
+        return None
+
+    def _build(self) -> None:
+        goto: List[Dict[str, int]] = [{}]
+        output: List[Optional[str]] = [None]
+        for trigger in self.substring:
+            if not trigger:
+                continue
+
+            state = 0
+            for character in trigger:
+                following = goto[state].get(character)
+                if following is None:
+                    following = goto[state][character] = len(goto)
+                    goto.append({})
+                    output.append(None)
+
+                state = following
+
+            output[state] = trigger
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for character, following in goto[state].items():
+                queue.append(following)
+                fallback = fail[state]
+                while fallback and character not in goto[fallback]:
+                    fallback = fail[fallback]
+
+                fail[following] = goto[fallback].get(character, 0)
+                if output[following] is None:
+                    # Nodes are visited shallowest first, so the suffix's output is already final.
+                    output[following] = output[fail[following]]
+
+        self._goto, self._fail, self._output = goto, fail, output
@@ -0,0 +1,218 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Iterable,
+    List,
+    Optional,
+    Tuple
+    )
+
+from discord import DiscordServerError, HTTPException, Message, RateLimited
+
+log = logging.getLogger(__name__)
+
+Progress = Callable[[int, int], Awaitable[Any]]
+
+
+@dataclass
+class BulkResult:
+    succeeded: List[Any] = field(default_factory=list)
+    failed: List[Tuple[Any, Exception]] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        return len(self.succeeded) + len(self.failed)
+
+    def summary(
+        self,
+        action: str,
+        noun: str
+    ) -> str:
+        text = f"Successfully {action} **{len(self.succeeded):,}**/{self.total:,} {noun}"
+        if self.failed:
+            text += f", **{len(self.failed):,}** failed"
+
+        return text
+
+
+def retry_after(exc: Exception) -> Optional[float]:
+    """
+    Read how long Discord asked us to wait from a rate limit error, if it did.
+    """
+    if isinstance(exc, RateLimited):
+        return exc.retry_after
+
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    for header in ("Retry-After", "X-RateLimit-Reset-After"):
+        try:
+            return float(headers[header])
+        except (KeyError, TypeError, ValueError):
+            continue
+
+    return None
+
+
+def message_progress(
+    message: Message,
+    text: str
+) -> Progress:
+    """
+    Progress callback that rewrites ``message``, ``text`` is formatted with ``done`` and ``total``.
+    """
+    async def progress(done: int, total: int):
+        description = text.format(done=done, total=total)
+        if message.embeds:
+            embed = message.embeds[0].copy()
+            embed.description = description
+            await message.edit(embed=embed)
+        else:
+            await message.edit(content=description)
+
+    return progress
+
+
+class BulkExecutor:
+    """
+    Run one REST action per item with bounded, adaptive concurrency.
+
+    Concurrency starts at ``concurrency`` and grows by one after a full
+    window of successes, up to ``max_concurrency``. discord.py already
+    waits out 429s and retries them itself, so a 429 that reaches us
+    means it gave up: concurrency is halved and every worker pauses for
+    the time the error carries. Those and server errors are retried with
+    exponential backoff, anything else is recorded as a failure for that
+    item. A worker gives its slot back before it sleeps.
+    """
+
+    def __init__(
+        self,
+        *,
+        concurrency: int = 2,
+        max_concurrency: int = 8,
+        retries: int = 3,
+        backoff: float = 1.0,
+        progress: Optional[Progress] = None,
+        progress_interval: float = 2.0
+    ):
+        self.limit = concurrency
+        self.max_concurrency = max_concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.progress = progress
+        self.progress_interval = progress_interval
+        self._active = 0
+        self._streak = 0
+        self._paused_until = 0.0
+        self._condition = asyncio.Condition()
+
+    async def run(
+        self,
+        items: Iterable[Any],
+        action: Callable[[Any], Awaitable[Any]]
+    ) -> BulkResult:
+        items = list(items)
+        result = BulkResult()
+        pending = iter(items)
+
+        async def worker():
+            for item in pending:
+                try:
+                    await self._attempt(item, action)
+                except Exception as exc:
+                    result.failed.append((item, exc))
+                else:
+                    result.succeeded.append(item)
+
+        reporter = asyncio.create_task(self._report(result, len(items))) if self.progress else None
+        try:
+            await asyncio.gather(*(worker() for _ in range(min(self.max_concurrency, len(items)))))
+        finally:
+            if reporter:
+                reporter.cancel()
+
+        if self.progress:
+            await self._progress(result.total, len(items))
+
+        return result
+
+    async def _attempt(
+        self,
+        item: Any,
+        action: Callable[[Any], Awaitable[Any]]
+    ) -> Any:
+        for attempt in range(self.retries + 1):
+            await self._acquire()
+            try:
+                value = await action(item)
+            except (RateLimited, HTTPException) as exc:
+                error = exc
+            else:
+                self._succeeded()
+                return value
+            finally:
+                await self._release()
+
+            limited = isinstance(error, RateLimited) or getattr(error, "status", None) == 429
+            if not limited and not isinstance(error, DiscordServerError) or attempt == self.retries:
+                raise error
+
+            delay = retry_after(error) if limited else None
+            await self._throttle(limited, delay or self.backoff * 2 ** attempt)
+
+    async def _acquire(self) -> None:
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._active < self.limit)
+            self._active += 1
+
+        pause = self._paused_until - monotonic()
+        if pause > 0:
+            await asyncio.sleep(pause)
+
+    async def _release(self) -> None:
+        async with self._condition:
+            self._active -= 1
+            self._condition.notify_all()
+
+    def _succeeded(self) -> None:
+        self._streak += 1
+        if self._streak >= self.limit and self.limit < self.max_concurrency:
+            self._streak = 0
+            self.limit += 1
+
+    async def _throttle(
+        self,
+        limited: bool,
+        delay: float
+    ) -> None:
+        self._streak = 0
+        if limited:
+            self.limit = max(1, self.limit // 2)
+            self._paused_until = max(self._paused_until, monotonic() + delay)
+            log.debug("Rate limited, concurrency now %d, pausing %.2fs", self.limit, delay)
+
+        await asyncio.sleep(delay)
+
+    async def _report(
+        self,
+        result: BulkResult,
+        total: int
+    ) -> None:
+        while True:
+            await asyncio.sleep(self.progress_interval)
+            await self._progress(result.total, total)
+
+    async def _progress(
+        self,
+        done: int,
+        total: int
+    ) -> None:
+        try:
+            await self.progress(done, total)
+        except HTTPException:
+            pass
@@ -0,0 +1,132 @@
+import asyncio
+import heapq
+import logging
+from time import time
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Tuple
+    )
+
+log = logging.getLogger(__name__)
+
+
+class ExpiryScheduler:
+    """
+    Keep upcoming deadlines in a min-heap and wake exactly at the next one.
+
+    Entries are keyed (e.g. ``("jail", guild_id, user_id)``) so rescheduling
+    or cancelling a key is O(log n) / O(1); stale heap entries are skipped
+    lazily when they reach the top. Every key that is due at wake-up is
+    handed to ``callback`` as a single batch.
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[List[Hashable]], Awaitable[None]]
+    ):
+        self.callback = callback
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        self._deadlines: Dict[Hashable, float] = {}
+        self._counter = 0
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._deadlines
+
+    def schedule(
+        self,
+        key: Hashable,
+        deadline: float
+    ) -> None:
+        """
+        Schedule (or reschedule) ``key`` to expire at the ``deadline`` epoch.
+        """
+        self._deadlines[key] = deadline
+        self._counter += 1
+        heapq.heappush(self._heap, (deadline, self._counter, key))
+
+        if self._heap[0][1] == self._counter:
+            self._wakeup.set()
+
+    def cancel(
+        self,
+        key: Hashable
+    ) -> bool:
+        """
+        Forget a pending deadline, returns whether one existed.
+        """
+        if self._deadlines.pop(key, None) is None:
+            return False
+
+        self._compact()
+        return True
+
+    def cancel_where(
+        self,
+        predicate: Callable[[Hashable], bool]
+    ) -> int:
+        """
+        Forget every pending deadline whose key matches ``predicate``.
+        """
+        keys = [key for key in self._deadlines if predicate(key)]
+        for key in keys:
+            del self._deadlines[key]
+
+        self._compact()
+        return len(keys)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def _compact(self) -> None:
+        if len(self._heap) > 2 * len(self._deadlines) + 64:
+            self._heap = [entry for entry in self._heap if self._deadlines.get(entry[2]) == entry[0]]
+            heapq.heapify(self._heap)
+
+    def _pop_due(
+        self,
+        now: float
+    ) -> List[Hashable]:
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            deadline, _, key = heapq.heappop(self._heap)
+            if self._deadlines.get(key) != deadline:
+                continue
+
+            del self._deadlines[key]
+            due.append(key)
+
+        return due
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            due = self._pop_due(time())
+            if due:
+                try:
+                    await self.callback(due)
+                except Exception:
+                    log.exception("Expiry callback failed for %d keys", len(due))
+
+                continue
+
+            timeout = self._heap[0][0] - time() if self._heap else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
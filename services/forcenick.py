@@ -0,0 +1,114 @@
+from time import monotonic
+from typing import (
+    Dict,
+    Optional,
+    Tuple
+    )
+
+from discord import Member
+
+
+class ForceNicknames:
+    """
+    In-memory view of the ``forcenick`` table for the member update listener.
+
+    Every forced nickname is loaded once into a per-guild map, so updates
+    for anyone else cost a dict lookup. The forcenickname commands apply
+    their writes here as well as to the table.
+
+    Before the bot edits a nickname it calls ``editing``, and until the
+    resulting update comes back (or ``echo_ttl`` passes) further updates
+    for that member are ignored, since they still carry the old nickname.
+    """
+
+    echo_ttl = 5.0
+
+    def __init__(
+        self,
+        storage
+    ):
+        self.storage = storage
+        self.guilds: Dict[int, Dict[int, str]] = {}
+        self._editing: Dict[Tuple[int, int], float] = {}
+
+    async def load(self) -> None:
+        rows = await self.storage.fetchall(
+            """
+            SELECT guild_id, user_id, nickname
+            FROM forcenick
+            """
+        )
+        self.guilds.clear()
+        for guild_id, user_id, nickname in rows:
+            self.guilds.setdefault(guild_id, {})[user_id] = nickname
+
+    def get(
+        self,
+        guild_id: int,
+        user_id: int
+    ) -> Optional[str]:
+        members = self.guilds.get(guild_id)
+        return members.get(user_id) if members else None
+
+    def set(
+        self,
+        guild_id: int,
+        user_id: int,
+        nickname: str
+    ) -> None:
+        self.guilds.setdefault(guild_id, {})[user_id] = nickname
+
+    def remove(
+        self,
+        guild_id: int,
+        user_id: int
+    ) -> None:
+        members = self.guilds.get(guild_id)
+        if members:
+            members.pop(user_id, None)
+            if not members:
+                del self.guilds[guild_id]
+
+        self._editing.pop((guild_id, user_id), None)
+
+    def reset(
+        self,
+        guild_id: int
+    ) -> None:
+        self.guilds.pop(guild_id, None)
+        for key in [key for key in self._editing if key[0] == guild_id]:
+            del self._editing[key]
+
+    def editing(
+        self,
+        member: Member
+    ) -> None:
+        """
+        Note that the bot is about to set ``member``'s nickname itself.
+        """
+        self._editing[(member.guild.id, member.id)] = monotonic() + self.echo_ttl
+
+    def enforce(
+        self,
+        member: Member
+    ) -> Optional[str]:
+        """
+        Return the nickname ``member`` has to be set back to, if any.
+        """
+        nickname = self.get(member.guild.id, member.id)
+        if nickname is None:
+            return None
+
+        key = (member.guild.id, member.id)
+        if member.nick == nickname:
+            self._editing.pop(key, None)
+            return None
+
+        deadline = self._editing.get(key)
+        if deadline is not None:
+            if deadline > monotonic():
+                return None
+
+            del self._editing[key]
+
+        return nickname
@@ -0,0 +1,244 @@
+import asyncio
+import logging
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from time import monotonic
+from typing import (
+    Deque,
+    Dict,
+    Iterator,
+    Optional,
+    Set,
+    Tuple
+    )
+
+from discord import (
+    Forbidden,
+    HTTPException,
+    NotFound,
+    TextChannel,
+    Webhook
+    )
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class Outgoing:
+    content: str
+    username: str
+    avatar_url: Optional[str]
+
+
+class WebhookForwarder:
+    """
+    Relay messages into channels through one cached webhook per channel.
+
+    Messages queued for a channel are held for ``window`` seconds and then
+    sent together, consecutive messages with the same identity are joined
+    into as few sends as the 2,000 character limit allows. A channel keeps
+    at most ``max_pending`` queued messages, anything past that is dropped
+    and counted. Channels the bot cannot manage webhooks in fall back to
+    plain sends with the author's name prefixed, and webhooks are not asked
+    for there again until ``webhook_retry`` seconds have passed.
+    """
+
+    limit = 2000
+    webhook_name = "speak"
+    webhook_retry = 300.0
+
+    def __init__(
+        self,
+        bot,
+        *,
+        window: float = 0.75,
+        max_pending: int = 200
+    ):
+        self.bot = bot
+        self.window = window
+        self.max_pending = max_pending
+        self.sent = 0
+        self.dropped = 0
+        self.failed = 0
+        self.webhooks: Dict[int, Webhook] = {}
+        self._webhook_ids: Set[int] = set()
+        self._denied: Dict[int, float] = {}
+        self._pending: Dict[int, Deque[Outgoing]] = defaultdict(deque)
+        self._tasks: Dict[int, asyncio.Task] = {}
+
+    @property
+    def depth(self) -> int:
+        return sum(len(queue) for queue in self._pending.values())
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "depth": self.depth,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+    def owns(
+        self,
+        webhook_id: Optional[int]
+    ) -> bool:
+        """
+        Whether a message's ``webhook_id`` belongs to one of our webhooks, so relays are not relayed back.
+        """
+        return webhook_id is not None and webhook_id in self._webhook_ids
+
+    def forward(
+        self,
+        channel: TextChannel,
+        content: str,
+        *,
+        username: str,
+        avatar_url: Optional[str] = None
+    ) -> bool:
+        """
+        Queue ``content`` for ``channel``, returns False when it was dropped.
+        """
+        if not content:
+            return False
+
+        queue = self._pending[channel.id]
+        if len(queue) >= self.max_pending:
+            self.dropped += 1
+            return False
+
+        queue.append(Outgoing(content, username, avatar_url))
+        task = self._tasks.get(channel.id)
+        if task is None or task.done():
+            self._tasks[channel.id] = asyncio.create_task(self._drain(channel))
+
+        return True
+
+    def forget(
+        self,
+        channel_id: int
+    ) -> None:
+        self._denied.pop(channel_id, None)
+        webhook = self.webhooks.pop(channel_id, None)
+        if webhook is not None:
+            self._webhook_ids.discard(webhook.id)
+
+    async def close(self) -> None:
+        for task in self._tasks.values():
+            task.cancel()
+
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        self._tasks.clear()
+        self.dropped += self.depth
+        self._pending.clear()
+
+    def _batches(
+        self,
+        queue: Deque[Outgoing]
+    ) -> Iterator[Tuple[str, Optional[str], str]]:
+        username, avatar_url, content = None, None, ""
+        while queue:
+            outgoing = queue.popleft()
+            if (outgoing.username, outgoing.avatar_url) != (username, avatar_url) or len(content) + len(outgoing.content) + 1 > self.limit:
+                if content:
+                    yield username, avatar_url, content
+
+                username, avatar_url, content = outgoing.username, outgoing.avatar_url, ""
+
+            text = outgoing.content
+            while len(text) > self.limit:
+                if content:
+                    yield username, avatar_url, content
+                    content = ""
+
+                yield username, avatar_url, text[:self.limit]
+                text = text[self.limit:]
+
+            content = f"{content}\n{text}" if content else text
+
+        if content:
+            yield username, avatar_url, content
+
+    async def _drain(
+        self,
+        channel: TextChannel
+    ) -> None:
+        try:
+            while True:
+                await asyncio.sleep(self.window)
+                queue = self._pending.get(channel.id)
+                if not queue:
+                    break
+
+                for username, avatar_url, content in self._batches(queue):
+                    await self._send(channel, content, username, avatar_url)
+        finally:
+            if self._tasks.get(channel.id) is asyncio.current_task():
+                del self._tasks[channel.id]
+
+            if not self._pending.get(channel.id):
+                self._pending.pop(channel.id, None)
+
+    async def _webhook(
+        self,
+        channel: TextChannel
+    ) -> Optional[Webhook]:
+        if channel.id in self.webhooks:
+            return self.webhooks[channel.id]
+
+        if self._denied.get(channel.id, 0) > monotonic():
+            return None
+
+        try:
+            webhook = next(
+                (
+                    webhook
+                    for webhook in await channel.webhooks()
+                    if webhook.token and webhook.user == self.bot.user
+                ),
+                None
+            ) or await channel.create_webhook(
+                name=self.webhook_name,
+                reason="Speak forwarding"
+            )
+        except Forbidden:
+            self._denied[channel.id] = monotonic() + self.webhook_retry
+            return None
+        except HTTPException:
+            log.exception("Failed to get a webhook for channel %s", channel.id)
+            return None
+
+        self._denied.pop(channel.id, None)
+        self.webhooks[channel.id] = webhook
+        self._webhook_ids.add(webhook.id)
+        return webhook
+
+    async def _send(
+        self,
+        channel: TextChannel,
+        content: str,
+        username: str,
+        avatar_url: Optional[str]
+    ) -> None:
+        for _ in range(2):
+            webhook = await self._webhook(channel)
+            try:
+                if webhook is None:
+                    prefix = f"**{username}:** "[:self.limit // 2]
+                    step = self.limit - len(prefix)
+                    for start in range(0, len(content), step):
+                        await channel.send(prefix + content[start:start + step])
+                else:
+                    await webhook.send(content, username=username, avatar_url=avatar_url)
+            except NotFound:
+                # The webhook was deleted from under us, make a new one once.
+                self.forget(channel.id)
+                continue
+            except HTTPException:
+                log.exception("Failed to forward to channel %s", channel.id)
+                self.failed += 1
+                return
+
+            self.sent += 1
+            return
+
+        self.failed += 1
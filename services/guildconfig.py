@@ -0,0 +1,217 @@
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import (
+    Dict,
+    Optional
+    )
+
+from .autoresponders import AutoResponderMatcher
+
+
+@dataclass
+class AutoResponder:
+    trigger: str
+    response: str
+    not_strict: bool = False
+    delete_trigger: bool = False
+    reply: bool = False
+
+
+@dataclass
+class GuildConfig:
+    guild_id: int
+    jail_channel_id: Optional[int] = None
+    jail_role_id: Optional[int] = None
+    noselfreact: bool = False
+    stickymessages: Dict[int, str] = field(default_factory=dict)
+    autoresponders: Dict[str, AutoResponder] = field(default_factory=dict)
+    _matcher: Optional[AutoResponderMatcher] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def jail_configured(self) -> bool:
+        return self.jail_role_id is not None
+
+    @property
+    def matcher(self) -> AutoResponderMatcher:
+        """
+        The compiled autoresponder triggers, rebuilt after ``autoresponders_changed``.
+        """
+        if self._matcher is None:
+            self._matcher = AutoResponderMatcher(self.autoresponders.values())
+
+        return self._matcher
+
+    def autoresponders_changed(self) -> None:
+        self._matcher = None
+
+
+class GuildConfigCache:
+    """
+    Lazily loaded per-guild configuration, bounded with LRU eviction.
+
+    Commands that write a config table apply the same change to the cached
+    entry through ``edit`` right after the write, so reads never go back to
+    the database while a guild stays in the cache.
+    """
+
+    def __init__(
+        self,
+        storage,
+        *,
+        maxsize: int = 1024
+    ):
+        self.storage = storage
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._configs: "OrderedDict[int, GuildConfig]" = OrderedDict()
+        self._loading: Dict[int, asyncio.Future] = {}
+        self._stale = set()
+
+    @classmethod
+    def attach(
+        cls,
+        bot,
+        storage,
+        **kwargs
+    ) -> "GuildConfigCache":
+        """
+        Return the cache shared by every cog, creating it on first use.
+
+        Whichever cog attaches first, the cache ends up as large as the
+        largest ``maxsize`` any of them asked for.
+        """
+        configs = getattr(bot, "guild_configs", None)
+        if configs is None:
+            configs = bot.guild_configs = cls(storage, **kwargs)
+        elif kwargs.get("maxsize", 0) > configs.maxsize:
+            configs.maxsize = kwargs["maxsize"]
+
+        return configs
+
+    def __len__(self) -> int:
+        return len(self._configs)
+
+    def __contains__(self, guild_id: int) -> bool:
+        return guild_id in self._configs
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._configs),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    async def get(
+        self,
+        guild_id: int
+    ) -> GuildConfig:
+        config = self._configs.get(guild_id)
+        if config is not None:
+            self.hits += 1
+            self._configs.move_to_end(guild_id)
+            return config
+
+        self.misses += 1
+        future = self._loading.get(guild_id)
+        if future is None:
+            future = self._loading[guild_id] = asyncio.ensure_future(self._load(guild_id))
+            future.add_done_callback(lambda _: self._loading.pop(guild_id, None))
+
+        return await asyncio.shield(future)
+
+    def edit(
+        self,
+        guild_id: int
+    ) -> Optional[GuildConfig]:
+        """
+        Return the cached config so a write can be applied to it.
+
+        A load that is still in flight may have read the table before the
+        write, so it is told to read again.
+        """
+        if guild_id in self._loading:
+            self._stale.add(guild_id)
+
+        return self._configs.get(guild_id)
+
+    def invalidate(
+        self,
+        guild_id: int
+    ) -> None:
+        if guild_id in self._loading:
+            self._stale.add(guild_id)
+
+        self._configs.pop(guild_id, None)
+
+    async def _load(
+        self,
+        guild_id: int
+    ) -> GuildConfig:
+        while True:
+            self._stale.discard(guild_id)
+            config = await self._fetch(guild_id)
+            if guild_id not in self._stale:
+                break
+
+        self._configs[guild_id] = config
+        while len(self._configs) > self.maxsize:
+            self._configs.popitem(last=False)
+            self.evictions += 1
+
+        return config
+
+    async def _fetch(
+        self,
+        guild_id: int
+    ) -> GuildConfig:
+        jail, noselfreact, stickymessages, autoresponders = await asyncio.gather(
+            self.storage.fetchone(
+                """
+                SELECT channel_id, role_id
+                FROM jail_config
+                WHERE guild_id = ?
+                """,
+                (guild_id,)
+            ),
+            self.storage.fetchone(
+                """
+                SELECT is_enabled
+                FROM noselfreact
+                WHERE guild_id = ?
+                """,
+                (guild_id,)
+            ),
+            self.storage.fetchall(
+                """
+                SELECT channel_id, message
+                FROM stickymessage
+                WHERE guild_id = ?
+                """,
+                (guild_id,)
+            ),
+            self.storage.fetchall(
+                """
+                SELECT trigger, response, not_strict, delete_trigger, reply
+                FROM autoresponder
+                WHERE guild_id = ?
+                """,
+                (guild_id,)
+            )
+        )
+
+        config = GuildConfig(guild_id)
+        if jail:
+            config.jail_channel_id, config.jail_role_id = jail
+
+        config.noselfreact = bool(noselfreact and noselfreact[0])
+        config.stickymessages = dict(stickymessages)
+        config.autoresponders = {
+            trigger: AutoResponder(trigger, response, bool(not_strict), bool(delete_trigger), bool(reply))
+            for trigger, response, not_strict, delete_trigger, reply in autoresponders
+        }
+        return config
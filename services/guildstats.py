@@ -0,0 +1,178 @@
+from dataclasses import dataclass, fields
+from typing import (
+    Dict,
+    Iterable
+    )
+
+from discord import (
+    CategoryChannel,
+    Guild,
+    Member,
+    Status,
+    TextChannel,
+    VoiceChannel
+    )
+from discord.abc import GuildChannel
+
+
+@dataclass
+class GuildStats:
+    humans: int = 0
+    bots: int = 0
+    online: int = 0
+    boosters: int = 0
+    text_channels: int = 0
+    voice_channels: int = 0
+    categories: int = 0
+
+    @property
+    def members(self) -> int:
+        return self.humans + self.bots
+
+    def add(
+        self,
+        other: "GuildStats",
+        sign: int = 1
+    ) -> None:
+        for field in fields(self):
+            setattr(self, field.name, getattr(self, field.name) + sign * getattr(other, field.name))
+
+    @classmethod
+    def of_member(
+        cls,
+        member: Member
+    ) -> "GuildStats":
+        return cls(
+            humans=not member.bot,
+            bots=member.bot,
+            online=not member.bot and member.status != Status.offline,
+            boosters=member.premium_since is not None,
+        )
+
+    @classmethod
+    def of_channel(
+        cls,
+        channel: GuildChannel
+    ) -> "GuildStats":
+        return cls(
+            text_channels=isinstance(channel, TextChannel),
+            voice_channels=isinstance(channel, VoiceChannel),
+            categories=isinstance(channel, CategoryChannel),
+        )
+
+    @classmethod
+    def of_guild(
+        cls,
+        guild: Guild
+    ) -> "GuildStats":
+        stats = cls(
+            text_channels=len(guild.text_channels),
+            voice_channels=len(guild.voice_channels),
+            categories=len(guild.categories),
+        )
+        for member in guild.members:
+            if member.bot:
+                stats.bots += 1
+            else:
+                stats.humans += 1
+                stats.online += member.status != Status.offline
+
+            stats.boosters += member.premium_since is not None
+
+        return stats
+
+
+class GuildStatsTracker:
+    """
+    Per-guild ``GuildStats`` snapshots plus their sum across every guild.
+
+    A guild is counted once, the first time it is queried after it has been
+    chunked. From then on the gateway event listeners apply each change to
+    both the guild snapshot and ``total`` as a delta.
+    """
+
+    def __init__(self):
+        self.total = GuildStats()
+        self._guilds: Dict[int, GuildStats] = {}
+
+    @classmethod
+    def attach(
+        cls,
+        bot
+    ) -> "GuildStatsTracker":
+        """
+        Return the tracker shared by every cog, creating it on first use.
+        """
+        tracker = getattr(bot, "guild_stats", None)
+        if tracker is None:
+            tracker = bot.guild_stats = cls()
+
+        return tracker
+
+    def get(
+        self,
+        guild: Guild
+    ) -> GuildStats:
+        stats = self._guilds.get(guild.id)
+        if stats is None:
+            stats = GuildStats.of_guild(guild)
+            if guild.chunked:
+                self._guilds[guild.id] = stats
+                self.total.add(stats)
+
+        return stats
+
+    def totals(
+        self,
+        guilds: Iterable[Guild]
+    ) -> GuildStats:
+        """
+        Return the sum over ``guilds``, counting any guild not tracked yet.
+        """
+        total = GuildStats()
+        total.add(self.total)
+        for guild in guilds:
+            if guild.id not in self._guilds:
+                total.add(self.get(guild))
+
+        return total
+
+    def forget(
+        self,
+        guild: Guild
+    ) -> None:
+        stats = self._guilds.pop(guild.id, None)
+        if stats is not None:
+            self.total.add(stats, -1)
+
+    def _apply(
+        self,
+        guild: Guild,
+        delta: GuildStats,
+        sign: int = 1
+    ) -> None:
+        stats = self._guilds.get(guild.id)
+        if stats is not None:
+            stats.add(delta, sign)
+            self.total.add(delta, sign)
+
+    def member_join(self, member: Member) -> None:
+        self._apply(member.guild, GuildStats.of_member(member))
+
+    def member_remove(self, member: Member) -> None:
+        self._apply(member.guild, GuildStats.of_member(member), -1)
+
+    def member_update(self, before: Member, after: Member) -> None:
+        """
+        Apply a status or boost change, used for member and presence updates.
+        """
+        delta = GuildStats.of_member(after)
+        delta.add(GuildStats.of_member(before), -1)
+        if delta != GuildStats():
+            self._apply(after.guild, delta)
+
+    def channel_create(self, channel: GuildChannel) -> None:
+        self._apply(channel.guild, GuildStats.of_channel(channel))
+
+    def channel_delete(self, channel: GuildChannel) -> None:
+        self._apply(channel.guild, GuildStats.of_channel(channel), -1)
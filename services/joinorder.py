@@ -0,0 +1,113 @@
+from bisect import bisect_left
+from typing import (
+    Dict,
+    List,
+    Tuple
+    )
+
+from discord import Guild, Member
+
+Key = Tuple[float, int]
+
+
+def join_key(member: Member) -> Key:
+    # Members without a join date sort last, as if they just joined.
+    joined_at = member.joined_at.timestamp() if member.joined_at else float("inf")
+    return joined_at, member.id
+
+
+class JoinOrder:
+    """
+    Per-guild members sorted by ``(joined_at, id)``.
+
+    A guild's array is built once, the first time it is queried after the
+    guild has been chunked, and is kept current by ``add`` and ``remove``
+    from the member join and remove events.
+    """
+
+    def __init__(self):
+        self._guilds: Dict[int, List[Key]] = {}
+
+    @classmethod
+    def attach(
+        cls,
+        bot
+    ) -> "JoinOrder":
+        """
+        Return the index shared by every cog, creating it on first use.
+        """
+        index = getattr(bot, "join_order", None)
+        if index is None:
+            index = bot.join_order = cls()
+
+        return index
+
+    def keys(
+        self,
+        guild: Guild
+    ) -> List[Key]:
+        keys = self._guilds.get(guild.id)
+        if keys is None:
+            keys = sorted(map(join_key, guild.members))
+            if guild.chunked:
+                self._guilds[guild.id] = keys
+
+        return keys
+
+    def add(
+        self,
+        member: Member
+    ) -> None:
+        keys = self._guilds.get(member.guild.id)
+        if keys is None:
+            return
+
+        key = join_key(member)
+        index = bisect_left(keys, key)
+        if index == len(keys) or keys[index] != key:
+            keys.insert(index, key)
+
+    def remove(
+        self,
+        member: Member
+    ) -> None:
+        keys = self._guilds.get(member.guild.id)
+        if keys is None:
+            return
+
+        key = join_key(member)
+        index = bisect_left(keys, key)
+        if index < len(keys) and keys[index] == key:
+            del keys[index]
+
+    def forget(
+        self,
+        guild: Guild
+    ) -> None:
+        self._guilds.pop(guild.id, None)
+
+    def position(
+        self,
+        member: Member
+    ) -> int:
+        """
+        Return the 1-based join position of ``member``.
+        """
+        return bisect_left(self.keys(member.guild), join_key(member)) + 1
+
+    def recent(
+        self,
+        guild: Guild,
+        amount: int
+    ) -> List[Member]:
+        """
+        Return up to ``amount`` members, most recently joined first.
+        """
+        keys = self.keys(guild)
+        members = []
+        for _, member_id in reversed(keys[-amount:] if amount > 0 else []):
+            member = guild.get_member(member_id)
+            if member:
+                members.append(member)
+
+        return members
@@ -0,0 +1,111 @@
+import asyncio
+import logging
+import os
+from collections import deque
+from dataclasses import dataclass
+from time import time
+from typing import (
+    Deque,
+    List,
+    Optional
+    )
+
+from psutil import Process
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class Sample:
+    timestamp: float
+    memory: int
+    cpu: float
+    fds: int
+
+
+def count_lines(directory: str) -> int:
+    """
+    Count the lines of every ``.py`` file under ``directory``.
+    """
+    total = 0
+    for root, _, files in os.walk(directory):
+        for file in files:
+            if file.endswith(".py"):
+                with open(os.path.join(root, file), "rb") as f:
+                    total += sum(chunk.count(b"\n") for chunk in iter(lambda: f.read(1 << 16), b""))
+
+    return total
+
+
+class MetricsSampler:
+    """
+    Sample process memory, CPU and open file descriptors on an interval.
+
+    Samples are taken in a thread, since reading USS walks smaps, and kept
+    in a ring buffer so readers get the latest value and a short trend for
+    free. The source line count is computed once per ``refresh_lines``.
+    """
+
+    def __init__(
+        self,
+        *,
+        interval: float = 30,
+        size: int = 120
+    ):
+        self.interval = interval
+        self.samples: Deque[Sample] = deque(maxlen=size)
+        self.lines = 0
+        self._process = Process()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def latest(self) -> Optional[Sample]:
+        return self.samples[-1] if self.samples else None
+
+    def trend(
+        self,
+        window: int = 10
+    ) -> List[Sample]:
+        """
+        Return the last ``window`` samples, oldest first.
+        """
+        return list(self.samples)[-window:]
+
+    async def refresh_lines(
+        self,
+        directory: str
+    ) -> int:
+        self.lines = await asyncio.to_thread(count_lines, directory)
+        return self.lines
+
+    def _sample(self) -> Sample:
+        with self._process.oneshot():
+            return Sample(
+                timestamp=time(),
+                memory=self._process.memory_full_info().uss,
+                cpu=self._process.cpu_percent(),
+                fds=self._process.num_fds() if hasattr(self._process, "num_fds") else 0,
+            )
+
+    async def sample(self) -> Sample:
+        sample = await asyncio.to_thread(self._sample)
+        self.samples.append(sample)
+        return sample
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.sample()
+            except Exception:
+                log.exception("Failed to sample process metrics")
+
+            await asyncio.sleep(self.interval)
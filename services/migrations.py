@@ -0,0 +1,343 @@
+import logging
+from datetime import datetime, timezone
+from time import time
+from typing import (
+    Awaitable,
+    Callable,
+    List,
+    Tuple
+    )
+
+log = logging.getLogger(__name__)
+
+chunk_size = 1000
+
+Migration = Callable[..., Awaitable[None]]
+MIGRATIONS: List[Tuple[int, str, Migration]] = []
+
+
+def migration(
+    version: int,
+    description: str
+) -> Callable[[Migration], Migration]:
+    def decorator(func: Migration) -> Migration:
+        MIGRATIONS.append((version, description, func))
+        MIGRATIONS.sort(key=lambda entry: entry[0])
+        return func
+
+    return decorator
+
+
+async def migrate(storage) -> List[int]:
+    """
+    Apply every migration newer than the recorded schema version, in order.
+    """
+    await storage.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at INTEGER NOT NULL
+        )
+        """
+    )
+    applied = {version for (version,) in await storage.fetchall("SELECT version FROM schema_version")}
+
+    ran = []
+    for version, description, func in MIGRATIONS:
+        if version in applied:
+            continue
+
+        log.info("Applying schema migration %d: %s", version, description)
+        await func(storage)
+        await storage.execute(
+            """
+            INSERT INTO schema_version (version, description, applied_at)
+            VALUES (?, ?, ?)
+            """,
+            (version, description, int(time()))
+        )
+        ran.append(version)
+
+    return ran
+
+
+async def deduplicate(
+    tx,
+    table: str,
+    columns: str
+) -> int:
+    """
+    Keep only the newest row per ``columns`` so a unique index can be built.
+
+    The rows dropped are copied as JSON into ``_dropped_duplicates`` first,
+    so anything they held (e.g. a jailed member's saved roles) can still be
+    recovered by hand.
+    """
+    duplicates = f"""
+        FROM {table}
+        WHERE rowid NOT IN (
+            SELECT MAX(rowid)
+            FROM {table}
+            GROUP BY {columns}
+        )
+        """
+    names = [column[1] for column in await tx.fetchall(f"PRAGMA table_info({table})")]
+    fields = ", ".join(f"'{name}', \"{name}\"" for name in names)
+    await tx.execute(
+        f"""
+        INSERT INTO _dropped_duplicates (source_table, source_rowid, row, dropped_at)
+        SELECT ?, rowid, json_object({fields}), ?
+        {duplicates}
+        """,
+        (table, int(time()))
+    )
+    removed = await tx.execute(f"DELETE {duplicates}")
+    if removed:
+        log.warning("Removed %d duplicate rows from %s, kept in _dropped_duplicates", removed, table)
+
+    return removed
+
+
+@migration(1, "integer expires_at for tempban and jailed_members")
+async def expiry_columns(storage) -> None:
+    for table in ("tempban", "jailed_members"):
+        columns = await storage.fetchall(f"PRAGMA table_info({table})")
+        if not any(column[1] == "expires_at" for column in columns):
+            await storage.execute(f"ALTER TABLE {table} ADD COLUMN expires_at INTEGER")
+
+    async with storage.transaction() as tx:
+        await tx.execute(
+            """
+            CREATE INDEX IF NOT EXISTS tempban_expires_at
+            ON tempban (expires_at, guild_id, user_id)
+            """
+        )
+        await tx.execute(
+            """
+            CREATE INDEX IF NOT EXISTS tempban_guild_expires_at
+            ON tempban (guild_id, expires_at, user_id)
+            """
+        )
+        await tx.execute(
+            """
+            CREATE INDEX IF NOT EXISTS jailed_members_expires_at
+            ON jailed_members (expires_at, guild_id, user_id, roles)
+            """
+        )
+
+    # Paged by rowid, a row that cannot be converted keeps a NULL expires_at and must not be picked again.
+    last = 0
+    while True:
+        rows = await storage.fetchall(
+            """
+            SELECT rowid
+            FROM jailed_members
+            WHERE rowid > ?
+            ORDER BY rowid
+            LIMIT ?
+            """,
+            (last, chunk_size)
+        )
+        if not rows:
+            break
+
+        await storage.execute(
+            """
+            UPDATE jailed_members
+            SET expires_at = jail_timestamp + duration
+            WHERE rowid BETWEEN ? AND ?
+            AND expires_at IS NULL
+            """,
+            (rows[0][0], rows[-1][0])
+        )
+        last = rows[-1][0]
+
+    skipped = await storage.fetchone(
+        """
+        SELECT COUNT(*)
+        FROM jailed_members
+        WHERE expires_at IS NULL
+        """
+    )
+    if skipped[0]:
+        log.warning("%d jailed_members rows have no jail_timestamp or duration and will not expire", skipped[0])
+
+    last = 0
+    while True:
+        rows = await storage.fetchall(
+            """
+            SELECT rowid, duration
+            FROM tempban
+            WHERE rowid > ?
+            AND expires_at IS NULL
+            ORDER BY rowid
+            LIMIT ?
+            """,
+            (last, chunk_size)
+        )
+        if not rows:
+            break
+
+        last = rows[-1][0]
+        converted = []
+        for rowid, duration in rows:
+            try:
+                expires_at = int(datetime.fromisoformat(duration).replace(tzinfo=timezone.utc).timestamp())
+            except (TypeError, ValueError):
+                log.warning("Skipping tempban row %d, its duration %r is not a date", rowid, duration)
+                continue
+
+            converted.append((expires_at, rowid))
+
+        await storage.executemany(
+            """
+            UPDATE tempban
+            SET expires_at = ?
+            WHERE rowid = ?
+            """,
+            converted
+        )
+
+
+@migration(2, "unique and covering indexes for moderation and donator lookups")
+async def lookup_indexes(storage) -> None:
+    unique = (
+        ("hardbanned", "guild_id, user_id"),
+        ("forcenick", "guild_id, user_id"),
+        ("jailed_members", "guild_id, user_id"),
+        ("selfaliases", "user_id, alias"),
+        ("autoresponder", "guild_id, trigger"),
+        ("stickymessage", "guild_id, channel_id"),
+    )
+
+    async with storage.transaction() as tx:
+        await tx.execute(
+            """
+            CREATE TABLE IF NOT EXISTS _dropped_duplicates (
+                source_table TEXT NOT NULL,
+                source_rowid INTEGER NOT NULL,
+                row TEXT NOT NULL,
+                dropped_at INTEGER NOT NULL
+            )
+            """
+        )
+        for table, columns in unique:
+            await deduplicate(tx, table, columns)
+            await tx.execute(
+                f"""
+                CREATE UNIQUE INDEX IF NOT EXISTS {table}_{columns.replace(", ", "_")}
+                ON {table} ({columns})
+                """
+            )
+
+        # Read on every message and every member update, answered from the index alone.
+        await tx.execute(
+            """
+            CREATE INDEX IF NOT EXISTS selfaliases_lookup
+            ON selfaliases (user_id, alias, command)
+            """
+        )
+        await tx.execute(
+            """
+            CREATE INDEX IF NOT EXISTS forcenick_lookup
+            ON forcenick (guild_id, user_id, nickname)
+            """
+        )
+
+        # Merge duplicate counters before the upsert target becomes unique.
+        await tx.execute(
+            """
+            UPDATE topcommands
+            SET uses = (
+                SELECT SUM(duplicate.uses)
+                FROM topcommands AS duplicate
+                WHERE duplicate.command = topcommands.command
+            )
+            WHERE rowid IN (
+                SELECT MAX(rowid)
+                FROM topcommands
+                GROUP BY command
+                HAVING COUNT(*) > 1
+            )
+            """
+        )
+        await deduplicate(tx, "topcommands", "command")
+        await tx.execute(
+            """
+            CREATE UNIQUE INDEX IF NOT EXISTS topcommands_command
+            ON topcommands (command)
+            """
+        )
+        await tx.execute(
+            """
+            CREATE INDEX IF NOT EXISTS topcommands_uses
+            ON topcommands (uses, command)
+            """
+        )
+        await tx.execute(
+            """
+            CREATE INDEX IF NOT EXISTS boosters_lost_expired_at
+            ON boosters_lost (expired_at)
+            """
+        )
+
+
+@migration(3, "persistent speak forwarding routes")
+async def speak_routes(storage) -> None:
+    await storage.execute(
+        """
+        CREATE TABLE IF NOT EXISTS speak_routes (
+            channel_id INTEGER PRIMARY KEY,
+            guild_id INTEGER NOT NULL,
+            target_id INTEGER NOT NULL
+        )
+        """
+    )
+
+
+@migration(4, "last posted sticky message per channel")
+async def sticky_last_message(storage) -> None:
+    columns = await storage.fetchall("PRAGMA table_info(stickymessage)")
+    if not any(column[1] == "last_message_id" for column in columns):
+        await storage.execute("ALTER TABLE stickymessage ADD COLUMN last_message_id INTEGER")
+
+
+@migration(5, "on-disk tier of the third-party response cache")
+async def response_cache(storage) -> None:
+    async with storage.transaction() as tx:
+        await tx.execute(
+            """
+            CREATE TABLE IF NOT EXISTS response_cache (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                expires_at REAL NOT NULL
+            )
+            """
+        )
+        await tx.execute(
+            """
+            CREATE INDEX IF NOT EXISTS response_cache_expires_at
+            ON response_cache (expires_at)
+            """
+        )
+
+
+@migration(6, "retry_at for expiries that failed with a retryable error")
+async def expiry_retry_at(storage) -> None:
+    for table in ("tempban", "jailed_members"):
+        columns = await storage.fetchall(f"PRAGMA table_info({table})")
+        if not any(column[1] == "retry_at" for column in columns):
+            await storage.execute(f"ALTER TABLE {table} ADD COLUMN retry_at INTEGER")
+
+
+@migration(7, "jail_config lookup by guild")
+async def jail_config_guild(storage) -> None:
+    async with storage.transaction() as tx:
+        await deduplicate(tx, "jail_config", "guild_id")
+        await tx.execute(
+            """
+            CREATE UNIQUE INDEX IF NOT EXISTS jail_config_guild
+            ON jail_config (guild_id)
+            """
+        )
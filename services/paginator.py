@@ -0,0 +1,158 @@
+import asyncio
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Optional,
+    Sequence,
+    Union
+    )
+
+from discord import ButtonStyle, Embed, Interaction, Message
+from discord.ui import Button, View, button
+
+Rows = Union[Sequence[Any], AsyncIterator[Any]]
+
+
+class Paginator(View):
+    """
+    Page through rows, formatting only the rows of the page being shown.
+
+    ``rows`` is either a sized sequence, which is sliced per page, or an
+    async iterator, which is consumed one page ahead of the viewer. Page
+    changes are serialized, since clicks can arrive while the iterator is
+    still being read.
+    """
+
+    def __init__(
+        self,
+        ctx,
+        embed: Embed,
+        rows: Rows,
+        formatter: Callable[[Any], str],
+        *,
+        per_page: int = 10,
+        text: Optional[str] = None,
+        timeout: float = 180
+    ):
+        super().__init__(timeout=timeout)
+        self.ctx = ctx
+        self.embed = embed
+        self.formatter = formatter
+        self.per_page = per_page
+        self.text = text
+        self.page = 0
+        self.message: Optional[Message] = None
+        self._lock = asyncio.Lock()
+
+        if hasattr(rows, "__anext__"):
+            self._iterator: Optional[AsyncIterator[Any]] = rows
+            self._rows: Sequence[Any] = []
+        else:
+            self._iterator = None
+            self._rows = rows
+
+    @property
+    def exhausted(self) -> bool:
+        return self._iterator is None
+
+    @property
+    def pages(self) -> Optional[int]:
+        if not self.exhausted:
+            return None
+
+        return max(1, -(-len(self._rows) // self.per_page))
+
+    async def _fill(self, count: int) -> None:
+        while not self.exhausted and len(self._rows) < count:
+            try:
+                self._rows.append(await self._iterator.__anext__())
+            except StopAsyncIteration:
+                self._iterator = None
+
+    async def render(self) -> Embed:
+        async with self._lock:
+            return await self._render()
+
+    async def _render(self) -> Embed:
+        start = self.page * self.per_page
+        # One row past the page tells whether a next page exists.
+        await self._fill(start + self.per_page + 1)
+
+        embed = self.embed.copy()
+        embed.description = "\n".join(
+            self.formatter(row)
+            for row in self._rows[start:start + self.per_page]
+        )
+
+        footer = f"Page {self.page + 1}/{self.pages if self.exhausted else '?'}"
+        if self.exhausted and self.text:
+            singular, _, plural = self.text.partition("|")
+            footer += f" ({len(self._rows):,} {singular if len(self._rows) == 1 else plural or singular})"
+
+        embed.set_footer(text=footer)
+
+        self.previous.disabled = self.page == 0
+        self.next.disabled = len(self._rows) <= start + self.per_page
+        return embed
+
+    async def start(self) -> Optional[Message]:
+        embed = await self.render()
+        if self.next.disabled and self.previous.disabled:
+            self.stop()
+            return await self.ctx.send(embed=embed)
+
+        self.message = await self.ctx.send(embed=embed, view=self)
+        return self.message
+
+    async def interaction_check(self, interaction: Interaction) -> bool:
+        if interaction.user.id != self.ctx.author.id:
+            await interaction.response.defer()
+            return False
+
+        return True
+
+    async def on_timeout(self) -> None:
+        if self.message:
+            try:
+                await self.message.edit(view=None)
+            except Exception:
+                pass
+
+    async def _show(self, interaction: Interaction, step: int) -> None:
+        async with self._lock:
+            page = max(0, self.page + step)
+            if step > 0 and self.next.disabled:
+                page = self.page
+
+            self.page = page
+            embed = await self._render()
+
+        await interaction.response.edit_message(embed=embed, view=self)
+
+    @button(label="<", style=ButtonStyle.secondary)
+    async def previous(self, interaction: Interaction, _: Button):
+        await self._show(interaction, -1)
+
+    @button(label=">", style=ButtonStyle.secondary)
+    async def next(self, interaction: Interaction, _: Button):
+        await self._show(interaction, 1)
+
+    @button(label="x", style=ButtonStyle.danger)
+    async def close(self, interaction: Interaction, _: Button):
+        self.stop()
+        await interaction.response.defer()
+        await interaction.delete_original_response()
+
+
+async def paginate(
+    ctx,
+    embed: Embed,
+    rows: Rows,
+    formatter: Callable[[Any], str],
+    **kwargs
+) -> Optional[Message]:
+    """
+    Send ``embed`` paginated over ``rows``, ``formatter`` renders one row per line.
+    """
+    return await Paginator(ctx, embed, rows, formatter, **kwargs).start()
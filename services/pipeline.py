@@ -0,0 +1,167 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from functools import cached_property
+from time import perf_counter
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple
+    )
+
+from discord import Message
+
+from .guildconfig import GuildConfig, GuildConfigCache
+from .storage import Storage
+
+log = logging.getLogger(__name__)
+
+Handler = Callable[["MessageContext"], Awaitable[None]]
+
+
+@dataclass
+class HandlerStats:
+    calls: int = 0
+    errors: int = 0
+    total: float = 0.0
+    slowest: float = 0.0
+
+    @property
+    def average(self) -> float:
+        return self.total / self.calls if self.calls else 0.0
+
+
+class MessageContext:
+    """
+    Per-message state shared by every pipeline handler, computed on first use.
+    """
+
+    def __init__(
+        self,
+        pipeline: "MessagePipeline",
+        message: Message
+    ):
+        self.pipeline = pipeline
+        self.bot = pipeline.bot
+        self.message = message
+        self.stopped = False
+        self._context = None
+        self._config: Optional[GuildConfig] = None
+
+    @cached_property
+    def content(self) -> str:
+        return self.message.content.lower()
+
+    async def context(self):
+        if self._context is None:
+            self._context = await self.bot.get_context(self.message)
+
+        return self._context
+
+    async def prefix(self) -> Optional[str]:
+        return (await self.context()).prefix
+
+    async def invoked_with(self) -> Optional[str]:
+        return (await self.context()).invoked_with
+
+    async def config(self) -> Optional[GuildConfig]:
+        if self._config is None and self.message.guild:
+            self._config = await self.pipeline.configs.get(self.message.guild.id)
+
+        return self._config
+
+    def stop(self) -> None:
+        """
+        Skip the handlers after this one for the current message.
+        """
+        self.stopped = True
+
+
+class MessagePipeline:
+    """
+    The single ``on_message`` listener that every message handler hangs off.
+
+    Handlers run one after another in priority order (lower first) against a
+    shared ``MessageContext``, so the message is parsed and its guild config
+    is loaded at most once no matter how many handlers need them. Each
+    handler's call count, errors and run time are recorded in ``stats``.
+    """
+
+    slow_handler = 0.25
+
+    def __init__(
+        self,
+        bot,
+        configs: GuildConfigCache
+    ):
+        self.bot = bot
+        self.configs = configs
+        self.stats: Dict[str, HandlerStats] = {}
+        self._handlers: List[Tuple[int, str, Handler]] = []
+
+    @classmethod
+    async def attach(
+        cls,
+        bot
+    ) -> "MessagePipeline":
+        """
+        Return the pipeline shared by every cog, registering its listener on first use.
+        """
+        async with _attach_lock:
+            pipeline = getattr(bot, "message_pipeline", None)
+            if pipeline is None:
+                storage = await Storage.attach(bot, hold=False)
+                pipeline = bot.message_pipeline = cls(bot, GuildConfigCache.attach(bot, storage))
+                bot.add_listener(pipeline.dispatch, "on_message")
+
+            return pipeline
+
+    def register(
+        self,
+        name: str,
+        handler: Handler,
+        *,
+        priority: int = 100
+    ) -> None:
+        self.unregister(name)
+        self._handlers.append((priority, name, handler))
+        self._handlers.sort(key=lambda entry: entry[0])
+        self.stats.setdefault(name, HandlerStats())
+
+    def unregister(
+        self,
+        name: str
+    ) -> None:
+        self._handlers = [entry for entry in self._handlers if entry[1] != name]
+
+    async def dispatch(
+        self,
+        message: Message
+    ) -> None:
+        context = MessageContext(self, message)
+        for _, name, handler in list(self._handlers):
+            if context.stopped:
+                break
+
+            stats = self.stats[name]
+            start = perf_counter()
+            try:
+                await handler(context)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                stats.errors += 1
+                log.exception("Message handler %s failed", name)
+            finally:
+                elapsed = perf_counter() - start
+                stats.calls += 1
+                stats.total += elapsed
+                stats.slowest = max(stats.slowest, elapsed)
+                if elapsed > self.slow_handler:
+                    log.warning("Message handler %s took %.3fs", name, elapsed)
+
+
+_attach_lock = asyncio.Lock()
@@ -0,0 +1,243 @@
+"""
+Check that no query in the cogs or services falls back to a full table scan.
+
+    python services/queryplan.py <database> [cog.py ...]
+
+Every SQL string literal in the given files (the cogs and services by default)
+is run through ``EXPLAIN QUERY PLAN`` against the database; the exit status is
+1 when any plan scans a table without an index. Storage.attach runs the same
+check after migrating and logs what it finds.
+
+An f-string is expanded into the statements it can produce: an interpolated
+name takes the string constants assigned to it in the enclosing function
+(``table = "a" if ... else "b"``, ``for kind, table in (("x", "a"), ...)``),
+or every table of the database when it has none. Statements without a WHERE,
+ORDER BY, GROUP BY or JOIN read every row by design and are not reported.
+"""
+import ast
+import itertools
+import re
+import sqlite3
+import sys
+from pathlib import Path
+from typing import (
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple
+    )
+
+COGS = Path(__file__).resolve().parent.parent
+SERVICES = Path(__file__).resolve().parent
+# Schema changes run once, their queries are allowed to scan.
+EXCLUDED = {"migrations.py", "queryplan.py"}
+STATEMENT = re.compile(r"^\s*(SELECT|INSERT|UPDATE|DELETE)\b")
+FULL_SCAN = re.compile(r"^SCAN (TABLE )?\w+( AS \w+)?$")
+FILTERED = re.compile(r"\b(WHERE|ORDER BY|GROUP BY|JOIN)\b", re.IGNORECASE)
+MAX_EXPANSIONS = 256
+
+Query = Tuple[str, int, List[str]]
+Bindings = Dict[str, List[str]]
+
+
+def default_paths() -> List[Path]:
+    return [
+        path for path in sorted(COGS.glob("*.py")) + sorted(SERVICES.glob("*.py"))
+        if path.name not in EXCLUDED
+    ]
+
+
+def tables(connection: sqlite3.Connection) -> List[str]:
+    return [
+        name for (name,) in connection.execute(
+            """
+            SELECT name
+            FROM sqlite_master
+            WHERE type = 'table'
+            AND name NOT LIKE 'sqlite_%'
+            """
+        )
+    ]
+
+
+def _constants(node: ast.expr) -> List[str]:
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return [node.value]
+
+    if isinstance(node, ast.IfExp):
+        body, orelse = _constants(node.body), _constants(node.orelse)
+        return body + orelse if body and orelse else []
+
+    return []
+
+
+def _bind(
+    bindings: Bindings,
+    target: ast.expr,
+    values: List[ast.expr]
+) -> None:
+    if isinstance(target, ast.Name):
+        constants = [constant for value in values for constant in _constants(value)]
+        if constants:
+            bindings.setdefault(target.id, []).extend(constants)
+    elif isinstance(target, (ast.Tuple, ast.List)):
+        for index, element in enumerate(target.elts):
+            _bind(bindings, element, [
+                value.elts[index] for value in values
+                if isinstance(value, (ast.Tuple, ast.List)) and len(value.elts) == len(target.elts)
+            ])
+
+
+def bindings(function: ast.AST) -> Bindings:
+    """
+    Map each local name to the string constants ``function`` assigns or loops it over.
+    """
+    found: Bindings = {}
+    for node in ast.walk(function):
+        if isinstance(node, ast.Assign):
+            for target in node.targets:
+                _bind(found, target, [node.value])
+        elif isinstance(node, ast.For) and isinstance(node.iter, (ast.Tuple, ast.List)):
+            _bind(found, node.target, node.iter.elts)
+
+    return {name: list(dict.fromkeys(values)) for name, values in found.items()}
+
+
+def _substitutions(
+    node: ast.expr,
+    names: Sequence[str],
+    local: Bindings
+) -> List[str]:
+    if isinstance(node, ast.Constant):
+        return [str(node.value)]
+
+    if isinstance(node, ast.IfExp):
+        return _substitutions(node.body, names, local) + _substitutions(node.orelse, names, local)
+
+    if isinstance(node, ast.Name) and node.id in local:
+        return local[node.id]
+
+    return list(names)
+
+
+def expand(
+    node: ast.JoinedStr,
+    names: Sequence[str],
+    local: Optional[Bindings] = None
+) -> List[str]:
+    """
+    Return the SQL statements an f-string can produce.
+
+    Interpolated names resolve through ``local`` when bound there and to
+    each of ``names`` (the database's tables) otherwise.
+    """
+    parts = [
+        [value.value] if isinstance(value, ast.Constant)
+        else _substitutions(value.value, names, local or {})
+        for value in node.values
+    ]
+    expansions = itertools.islice(itertools.product(*parts), MAX_EXPANSIONS)
+    return [sql for sql in ("".join(parts) for parts in expansions) if STATEMENT.match(sql)]
+
+
+def collect_queries(
+    paths: Iterable[Path],
+    names: Sequence[str] = ()
+) -> List[Query]:
+    """
+    Return ``(file, line, candidates)`` for every SQL string in ``paths``.
+
+    A plain literal has itself as the only candidate, an f-string has every
+    expansion over ``names``.
+    """
+    queries = []
+    for path in paths:
+        tree = ast.parse(Path(path).read_text(), str(path))
+        # Outer functions are walked first, so a nested function's own bindings win.
+        scopes: Dict[int, Bindings] = {}
+        for function in ast.walk(tree):
+            if isinstance(function, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                local = bindings(function)
+                scopes.update((id(node), local) for node in ast.walk(function))
+
+        skipped = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.JoinedStr):
+                skipped.update(id(value) for value in node.values)
+            elif isinstance(node, ast.Expr):
+                skipped.add(id(node.value))
+
+        for node in ast.walk(tree):
+            if id(node) in skipped:
+                continue
+
+            if isinstance(node, ast.Constant) and isinstance(node.value, str) and STATEMENT.match(node.value):
+                queries.append((Path(path).name, node.lineno, [node.value]))
+            elif isinstance(node, ast.JoinedStr):
+                candidates = expand(node, names, scopes.get(id(node), {}))
+                if candidates:
+                    queries.append((Path(path).name, node.lineno, candidates))
+
+    return queries
+
+
+def full_scans(
+    connection: sqlite3.Connection,
+    queries: Iterable[Query]
+) -> List[Tuple[str, int, str]]:
+    """
+    Return ``(file, line, plan detail)`` for every query that scans a whole table.
+
+    Candidates the database cannot explain are ignored as long as one of them
+    can, since most table substitutions of an f-string are not real queries.
+    """
+    failures = []
+    for filename, line, candidates in queries:
+        details, errors = set(), []
+        for sql in candidates:
+            try:
+                plan = connection.execute(f"EXPLAIN QUERY PLAN {sql}", [None] * sql.count("?")).fetchall()
+            except sqlite3.Error as exc:
+                errors.append(exc)
+                continue
+
+            if FILTERED.search(sql):
+                details.update(detail for *_, detail in plan if FULL_SCAN.match(detail))
+
+        if len(errors) == len(candidates):
+            failures.append((filename, line, f"cannot explain: {errors[0]}"))
+
+        failures.extend((filename, line, detail) for detail in sorted(details))
+
+    return failures
+
+
+def check(database: str, paths: Iterable[Path] = ()) -> List[Tuple[str, int, str]]:
+    """
+    Return the full scans of the queries in ``paths`` (the cogs and services by default).
+    """
+    connection = sqlite3.connect(f"file:{database}?mode=ro", uri=True)
+    try:
+        return full_scans(connection, collect_queries(list(paths) or default_paths(), tables(connection)))
+    finally:
+        connection.close()
+
+
+def main(argv: List[str]) -> int:
+    if not argv:
+        print(__doc__.strip())
+        return 2
+
+    database, *cogs = argv
+    failures = check(database, [Path(cog) for cog in cogs])
+
+    for filename, line, detail in failures:
+        print(f"{filename}:{line}: {detail}")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,281 @@
+import asyncio
+import json
+import logging
+from collections import OrderedDict
+from time import time
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple
+    )
+
+from discord import Embed
+
+log = logging.getLogger(__name__)
+
+Fetch = Callable[[], Awaitable[Any]]
+
+
+def normalize(query: Any) -> str:
+    """
+    Case and whitespace insensitive key for a query string or a structure of them.
+    """
+    if isinstance(query, str):
+        return " ".join(query.casefold().split())
+
+    if isinstance(query, dict):
+        return json.dumps({normalize(key): normalize(value) for key, value in query.items()}, sort_keys=True)
+
+    if isinstance(query, (list, tuple)):
+        return json.dumps([normalize(value) for value in query])
+
+    return json.dumps(query)
+
+
+def dump_embeds(embeds: Optional[List[Embed]]) -> Optional[List[dict]]:
+    return [embed.to_dict() for embed in embeds] if embeds else embeds
+
+
+def load_embeds(data: Optional[List[dict]]) -> Optional[List[Embed]]:
+    return [Embed.from_dict(embed) for embed in data] if data else data
+
+
+class ResponseCache:
+    """
+    TTL cache for third-party lookups, shared by every command that makes them.
+
+    Entries are keyed by source and normalized query and stored as JSON, so
+    every hit hands out fresh objects and the memory tier can be bounded by
+    ``max_bytes`` with LRU eviction. When ``storage`` is given, entries are
+    also written behind to the ``response_cache`` table and survive restarts.
+    Concurrent lookups of the same key share one request, and results that
+    are empty (or rejected by ``cacheable``) are returned but not stored.
+    """
+
+    ttls: Dict[str, float] = {
+        "urbandictionary": 3600,
+        "github": 600,
+        "books": 86400,
+        "wikipedia": 3600,
+        "mangadex": 1800,
+        "batoto": 1800,
+    }
+    default_ttl = 600
+
+    def __init__(
+        self,
+        bot,
+        storage=None,
+        *,
+        max_bytes: int = 32 * 1024 * 1024
+    ):
+        self.bot = bot
+        self.storage = storage
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    @classmethod
+    def attach(
+        cls,
+        bot,
+        storage=None,
+        **kwargs
+    ) -> "ResponseCache":
+        """
+        Return the cache shared by every cog, creating it on first use.
+        """
+        cache = getattr(bot, "response_cache", None)
+        if cache is None:
+            cache = bot.response_cache = cls(bot, storage, **kwargs)
+
+        return cache
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.size,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    async def fetch(
+        self,
+        source: str,
+        query: Any,
+        fetch: Fetch,
+        *,
+        dump: Callable[[Any], Any] = lambda value: value,
+        load: Callable[[Any], Any] = lambda value: value,
+        cacheable: Callable[[Any], bool] = bool
+    ) -> Any:
+        """
+        Return the cached result for ``query`` on ``source``, calling ``fetch`` on a miss.
+
+        ``dump`` turns a result into something JSON serializable and ``load``
+        turns that back into a result.
+        """
+        key = f"{source}:{normalize(query)}"
+        data = await self._get(key)
+        if data is not None:
+            return load(json.loads(data))
+
+        future = self._inflight.get(key)
+        if future is None:
+            self.misses += 1
+            future = self._inflight[key] = asyncio.ensure_future(self._fetch(source, key, fetch, dump, cacheable))
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        result, data = await asyncio.shield(future)
+        return load(json.loads(data)) if data is not None else result
+
+    async def get_json(
+        self,
+        source: str,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Tuple[int, Any]:
+        """
+        GET ``url`` through ``bot.session``, returns the status and decoded JSON.
+
+        Only 200 responses are cached, the body is None for any other status.
+        """
+        async def fetch():
+            async with self.bot.session.get(url, params=params) as response:
+                if response.status != 200:
+                    return response.status, None
+
+                return response.status, await response.json()
+
+        return tuple(
+            await self.fetch(
+                source,
+                (url, params or {}),
+                fetch,
+                cacheable=lambda result: result[0] == 200
+            )
+        )
+
+    async def _get(
+        self,
+        key: str
+    ) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, data = entry
+            if expires_at > time():
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return data
+
+            self._evict(key)
+
+        if self.storage is None:
+            return None
+
+        row = await self.storage.fetchone(
+            """
+            SELECT value, expires_at
+            FROM response_cache
+            WHERE key = ?
+            """,
+            (key,)
+        )
+        if row is None or row[1] <= time():
+            return None
+
+        self.disk_hits += 1
+        self._remember(key, row[1], row[0])
+        return row[0]
+
+    async def _fetch(
+        self,
+        source: str,
+        key: str,
+        fetch: Fetch,
+        dump: Callable[[Any], Any],
+        cacheable: Callable[[Any], bool]
+    ) -> Tuple[Any, Optional[bytes]]:
+        result = await fetch()
+        if not cacheable(result):
+            return result, None
+
+        try:
+            data = json.dumps(dump(result)).encode()
+        except (TypeError, ValueError):
+            log.warning("Could not serialize a %s response, not caching it", source)
+            return result, None
+
+        expires_at = time() + self.ttls.get(source, self.default_ttl)
+        self._remember(key, expires_at, data)
+        if self.storage is not None:
+            await self.storage.write(
+                """
+                INSERT INTO response_cache (key, value, expires_at)
+                VALUES (?, ?, ?)
+                ON CONFLICT (key) DO UPDATE
+                SET value = excluded.value,
+                expires_at = excluded.expires_at
+                """,
+                (key, data, expires_at),
+                write_class="cache",
+                key=("response_cache", key)
+            )
+
+        return result, data
+
+    def _remember(
+        self,
+        key: str,
+        expires_at: float,
+        data: bytes
+    ) -> None:
+        if len(data) > self.max_bytes // 8:
+            return
+
+        self._evict(key)
+        self._entries[key] = (expires_at, data)
+        self.size += len(data)
+        while self.size > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._evict(oldest)
+            self.evictions += 1
+
+    def _evict(
+        self,
+        key: str
+    ) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= len(entry[1])
+
+    async def prune(self) -> int:
+        """
+        Delete expired rows from the disk tier.
+        """
+        if self.storage is None:
+            return 0
+
+        return await self.storage.execute(
+            """
+            DELETE FROM response_cache
+            WHERE expires_at <= ?
+            """,
+            (time(),)
+        )
@@ -0,0 +1,110 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from time import perf_counter
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Optional,
+    Sequence,
+    Tuple
+    )
+
+log = logging.getLogger(__name__)
+
+Search = Callable[[], Awaitable[Any]]
+
+
+@dataclass
+class SourceStats:
+    queries: int = 0
+    hits: int = 0
+    timeouts: int = 0
+    errors: int = 0
+    cancelled: int = 0
+    total: float = 0.0
+
+    @property
+    def answered(self) -> int:
+        return self.queries - self.timeouts - self.errors - self.cancelled
+
+    @property
+    def average(self) -> float:
+        return self.total / self.answered if self.answered else 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.answered if self.answered else 0.0
+
+
+class FanoutSearch:
+    """
+    Query several sources at once and keep the best one that has results.
+
+    Every source starts immediately under its own deadline. Sources are
+    ranked by the order they are passed in, and the search returns as soon
+    as the highest ranked source with results answers, cancelling whatever
+    is still running. A source that times out or raises counts as a miss.
+    Latency, hits, timeouts and errors are recorded per source in ``stats``.
+    """
+
+    def __init__(
+        self,
+        *,
+        timeout: float = 8.0,
+        timeouts: Optional[Dict[str, float]] = None
+    ):
+        self.timeout = timeout
+        self.timeouts = timeouts or {}
+        self.stats: Dict[str, SourceStats] = {}
+
+    async def first(
+        self,
+        searches: Sequence[Tuple[str, Search]]
+    ) -> Optional[Tuple[str, Any]]:
+        """
+        Return ``(source, results)`` from the highest ranked source with results.
+        """
+        tasks = [
+            (name, asyncio.create_task(self._query(name, search)))
+            for name, search in searches
+        ]
+        try:
+            for name, task in tasks:
+                results = await task
+                if results:
+                    return name, results
+        finally:
+            for _, task in tasks:
+                task.cancel()
+
+        return None
+
+    async def _query(
+        self,
+        name: str,
+        search: Search
+    ) -> Any:
+        stats = self.stats.setdefault(name, SourceStats())
+        stats.queries += 1
+        started = perf_counter()
+        try:
+            results = await asyncio.wait_for(search(), self.timeouts.get(name, self.timeout))
+        except asyncio.TimeoutError:
+            stats.timeouts += 1
+            return None
+        except asyncio.CancelledError:
+            stats.cancelled += 1
+            raise
+        except Exception:
+            stats.errors += 1
+            log.exception("Search on %s failed", name)
+            return None
+
+        stats.total += perf_counter() - started
+        if results:
+            stats.hits += 1
+
+        return results
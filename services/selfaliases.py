@@ -0,0 +1,134 @@
+import asyncio
+from collections import OrderedDict
+from time import monotonic
+from typing import (
+    Dict,
+    Optional,
+    Set,
+    Tuple
+    )
+
+
+class SelfAliasIndex:
+    """
+    In-memory view of the ``selfaliases`` table for the per-message lookup.
+
+    The set of users that own any alias is loaded once, so a message from
+    anyone else (almost every message) is answered without touching SQLite.
+    Owners' alias maps are loaded on demand into an LRU with a TTL. The
+    selfalias commands apply their writes here as well as to the table.
+    """
+
+    def __init__(
+        self,
+        storage,
+        *,
+        maxsize: int = 4096,
+        ttl: float = 3600
+    ):
+        self.storage = storage
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.owners: Set[int] = set()
+        self._aliases: "OrderedDict[int, Tuple[float, Dict[str, str]]]" = OrderedDict()
+        self._loaded = False
+        self._lock = asyncio.Lock()
+
+    async def load(self) -> None:
+        async with self._lock:
+            if self._loaded:
+                return
+
+            rows = await self.storage.fetchall(
+                """
+                SELECT DISTINCT user_id
+                FROM selfaliases
+                """
+            )
+            self.owners.update(user_id for (user_id,) in rows)
+            self._loaded = True
+
+    async def aliases(
+        self,
+        user_id: int
+    ) -> Dict[str, str]:
+        """
+        Return ``{alias: command}`` for a user.
+        """
+        if not self._loaded:
+            await self.load()
+
+        if user_id not in self.owners:
+            return {}
+
+        entry = self._aliases.get(user_id)
+        if entry is not None and entry[0] > monotonic():
+            self._aliases.move_to_end(user_id)
+            return entry[1]
+
+        rows = await self.storage.fetchall(
+            """
+            SELECT alias, command
+            FROM selfaliases
+            WHERE user_id = ?
+            """,
+            (user_id,)
+        )
+        aliases = dict(rows)
+        if not aliases:
+            self.owners.discard(user_id)
+            return aliases
+
+        self._store(user_id, aliases)
+        return aliases
+
+    async def get(
+        self,
+        user_id: int,
+        alias: str
+    ) -> Optional[str]:
+        if self._loaded and user_id not in self.owners:
+            return None
+
+        return (await self.aliases(user_id)).get(alias)
+
+    def add(
+        self,
+        user_id: int,
+        alias: str,
+        command: str
+    ) -> None:
+        self.owners.add(user_id)
+        entry = self._aliases.get(user_id)
+        if entry is not None:
+            entry[1][alias] = command
+
+    def remove(
+        self,
+        user_id: int,
+        alias: str
+    ) -> None:
+        entry = self._aliases.get(user_id)
+        if entry is None:
+            return
+
+        entry[1].pop(alias, None)
+        if not entry[1]:
+            self.reset(user_id)
+
+    def reset(
+        self,
+        user_id: int
+    ) -> None:
+        self.owners.discard(user_id)
+        self._aliases.pop(user_id, None)
+
+    def _store(
+        self,
+        user_id: int,
+        aliases: Dict[str, str]
+    ) -> None:
+        self._aliases[user_id] = (monotonic() + self.ttl, aliases)
+        self._aliases.move_to_end(user_id)
+        while len(self._aliases) > self.maxsize:
+            self._aliases.popitem(last=False)
@@ -0,0 +1,137 @@
+import asyncio
+import math
+from collections import defaultdict, deque
+from typing import (
+    Deque,
+    Dict,
+    Optional,
+    Tuple
+    )
+
+from discord import Guild
+
+
+def percentile(
+    ordered,
+    fraction: float
+) -> float:
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class ShardStats:
+    """
+    Guild and member counts per shard plus a short heartbeat latency history.
+
+    Counts are taken from ``bot.guilds`` once every shard is ready (and
+    again whenever a shard reconnects) and then kept current by the guild
+    join/remove and member join/remove listeners. Until then they are
+    counted on each call. Latency is sampled
+    from every shard on an interval into a ring buffer per shard.
+    """
+
+    def __init__(
+        self,
+        bot,
+        *,
+        interval: float = 15,
+        size: int = 240
+    ):
+        self.bot = bot
+        self.interval = interval
+        self.size = size
+        self.guilds: Dict[int, int] = defaultdict(int)
+        self.members: Dict[int, int] = defaultdict(int)
+        self.latencies: Dict[int, Deque[float]] = defaultdict(lambda: deque(maxlen=self.size))
+        self._built = False
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def attach(
+        cls,
+        bot
+    ) -> "ShardStats":
+        """
+        Return the shard stats shared by every cog, creating them on first use.
+        """
+        stats = getattr(bot, "shard_stats", None)
+        if stats is None:
+            stats = bot.shard_stats = cls(bot)
+
+        return stats
+
+    def build(self) -> None:
+        if self._built or not self.bot.is_ready():
+            return
+
+        self.guilds.clear()
+        self.members.clear()
+        for guild in self.bot.guilds:
+            self.guilds[guild.shard_id] += 1
+            self.members[guild.shard_id] += guild.member_count or 0
+
+        self._built = True
+
+    def rebuild(self) -> None:
+        self._built = False
+        self.build()
+
+    def counts(
+        self,
+        shard_id: int
+    ) -> Tuple[int, int]:
+        self.build()
+        if not self._built:
+            guilds = [guild for guild in self.bot.guilds if guild.shard_id == shard_id]
+            return len(guilds), sum(guild.member_count or 0 for guild in guilds)
+
+        return self.guilds[shard_id], self.members[shard_id]
+
+    def latency(
+        self,
+        shard_id: int
+    ) -> Optional[Tuple[float, float]]:
+        """
+        Return the p50 and p99 heartbeat latency of a shard in seconds, None before any sample.
+        """
+        history = sorted(self.latencies[shard_id])
+        if not history:
+            return None
+
+        return percentile(history, 0.5), percentile(history, 0.99)
+
+    def guild_join(self, guild: Guild) -> None:
+        if self._built:
+            self.guilds[guild.shard_id] += 1
+            self.members[guild.shard_id] += guild.member_count or 0
+
+    def guild_remove(self, guild: Guild) -> None:
+        if self._built:
+            self.guilds[guild.shard_id] -= 1
+            self.members[guild.shard_id] -= guild.member_count or 0
+
+    def member_join(self, guild: Guild) -> None:
+        if self._built:
+            self.members[guild.shard_id] += 1
+
+    def member_remove(self, guild: Guild) -> None:
+        if self._built:
+            self.members[guild.shard_id] -= 1
+
+    def sample(self) -> None:
+        for shard_id, shard in self.bot.shards.items():
+            if math.isfinite(shard.latency):
+                self.latencies[shard_id].append(shard.latency)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            self.sample()
+            await asyncio.sleep(self.interval)
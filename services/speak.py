@@ -0,0 +1,103 @@
+from collections import defaultdict
+from typing import (
+    Dict,
+    Optional,
+    Set
+    )
+
+
+class SpeakRoutes:
+    """
+    Speak forwarding routes, indexed in both directions and backed by ``speak_routes``.
+
+    ``forward`` maps a source channel to the channel its messages are sent
+    to, ``reverse`` maps a target channel back to every source feeding it,
+    so routing a message is two dict lookups.
+    """
+
+    def __init__(
+        self,
+        storage
+    ):
+        self.storage = storage
+        self.forward: Dict[int, int] = {}
+        self.reverse: Dict[int, Set[int]] = defaultdict(set)
+
+    async def load(self) -> None:
+        rows = await self.storage.fetchall(
+            """
+            SELECT channel_id, target_id
+            FROM speak_routes
+            """
+        )
+        self.forward.clear()
+        self.reverse.clear()
+        for channel_id, target_id in rows:
+            self._link(channel_id, target_id)
+
+    def target(
+        self,
+        channel_id: int
+    ) -> Optional[int]:
+        return self.forward.get(channel_id)
+
+    def sources(
+        self,
+        channel_id: int
+    ) -> Set[int]:
+        return self.reverse.get(channel_id, set())
+
+    async def add(
+        self,
+        guild_id: int,
+        channel_id: int,
+        target_id: int
+    ) -> None:
+        await self.storage.execute(
+            """
+            INSERT INTO speak_routes (channel_id, guild_id, target_id)
+            VALUES (?, ?, ?)
+            ON CONFLICT (channel_id) DO UPDATE
+            SET guild_id = excluded.guild_id,
+            target_id = excluded.target_id
+            """,
+            (channel_id, guild_id, target_id)
+        )
+        self._unlink(channel_id)
+        self._link(channel_id, target_id)
+
+    async def remove(
+        self,
+        channel_id: int
+    ) -> bool:
+        removed = await self.storage.execute(
+            """
+            DELETE FROM speak_routes
+            WHERE channel_id = ?
+            """,
+            (channel_id,)
+        )
+        self._unlink(channel_id)
+        return removed > 0
+
+    def _link(
+        self,
+        channel_id: int,
+        target_id: int
+    ) -> None:
+        self.forward[channel_id] = target_id
+        self.reverse[target_id].add(channel_id)
+
+    def _unlink(
+        self,
+        channel_id: int
+    ) -> None:
+        target_id = self.forward.pop(channel_id, None)
+        if target_id is None:
+            return
+
+        sources = self.reverse.get(target_id)
+        if sources is not None:
+            sources.discard(channel_id)
+            if not sources:
+                del self.reverse[target_id]
@@ -0,0 +1,197 @@
+import asyncio
+import logging
+from time import monotonic
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    Optional
+    )
+
+from discord import (
+    HTTPException,
+    Message,
+    NotFound,
+    TextChannel
+    )
+
+from .guildconfig import GuildConfigCache
+
+log = logging.getLogger(__name__)
+
+Post = Callable[[TextChannel, str, Message], Awaitable[Message]]
+
+
+class StickyMessages:
+    """
+    Re-post each channel's sticky message once activity in it settles.
+
+    Every message only pushes the channel's deadline back, the sticky is
+    re-posted ``quiet`` seconds after the last one (or ``max_wait`` seconds
+    after the first, for channels that never go quiet). The template is
+    rendered once per re-post, against the last message of the burst. The
+    ID of the sticky currently posted in each channel is kept in memory and
+    written to ``stickymessage.last_message_id``, which is read back on the
+    first re-post after a restart.
+
+    The channels that have a sticky are kept in ``channels``, loaded once
+    and updated by the stickymessage commands, so messages anywhere else
+    are skipped without touching the guild config.
+    """
+
+    def __init__(
+        self,
+        bot,
+        storage,
+        configs: GuildConfigCache,
+        post: Post,
+        *,
+        quiet: float = 3.0,
+        max_wait: float = 30.0
+    ):
+        self.bot = bot
+        self.storage = storage
+        self.configs = configs
+        self.post = post
+        self.quiet = quiet
+        self.max_wait = max_wait
+        self.channels: Dict[int, int] = {}
+        self.posted: Dict[int, int] = {}
+        self.reposts = 0
+        self._deadlines: Dict[int, float] = {}
+        self._latest: Dict[int, Message] = {}
+        self._tasks: Dict[int, asyncio.Task] = {}
+
+    async def load(self) -> None:
+        rows = await self.storage.fetchall(
+            """
+            SELECT channel_id, guild_id
+            FROM stickymessage
+            """
+        )
+        self.channels = dict(rows)
+
+    def add(
+        self,
+        guild_id: int,
+        channel_id: int
+    ) -> None:
+        self.channels[channel_id] = guild_id
+
+    def reset(
+        self,
+        guild_id: int
+    ) -> None:
+        for channel_id in [channel_id for channel_id, owner in self.channels.items() if owner == guild_id]:
+            self.forget(channel_id)
+
+    def activity(
+        self,
+        message: Message
+    ) -> None:
+        """
+        Note a message, scheduling a re-post if it is in a sticky channel and none is pending.
+        """
+        channel_id = message.channel.id
+        if channel_id not in self.channels:
+            return
+
+        self._latest[channel_id] = message
+        now = monotonic()
+        self._deadlines[channel_id] = now + self.quiet
+        task = self._tasks.get(channel_id)
+        if task is None or task.done():
+            self._tasks[channel_id] = asyncio.create_task(self._wait(message.channel, now + self.max_wait))
+
+    def forget(
+        self,
+        channel_id: int
+    ) -> Optional[int]:
+        """
+        Stop tracking a channel, returns the ID of its posted sticky.
+        """
+        self.channels.pop(channel_id, None)
+        task = self._tasks.pop(channel_id, None)
+        if task is not None:
+            task.cancel()
+
+        self._deadlines.pop(channel_id, None)
+        self._latest.pop(channel_id, None)
+        return self.posted.pop(channel_id, None)
+
+    def stop(self) -> None:
+        for task in self._tasks.values():
+            task.cancel()
+
+        self._tasks.clear()
+        self._deadlines.clear()
+        self._latest.clear()
+
+    async def _wait(
+        self,
+        channel: TextChannel,
+        limit: float
+    ) -> None:
+        try:
+            while True:
+                delay = min(self._deadlines[channel.id], limit) - monotonic()
+                if delay <= 0:
+                    break
+
+                await asyncio.sleep(delay)
+
+            del self._tasks[channel.id]
+            self._deadlines.pop(channel.id, None)
+            message = self._latest.pop(channel.id)
+            await self._repost(channel, message)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            log.exception("Failed to re-post the sticky message in channel %s", channel.id)
+
+    async def _repost(
+        self,
+        channel: TextChannel,
+        message: Message
+    ) -> None:
+        guild_config = await self.configs.get(channel.guild.id)
+        template = guild_config.stickymessages.get(channel.id)
+        if template is None:
+            self.posted.pop(channel.id, None)
+            return
+
+        previous = self.posted.get(channel.id)
+        if previous is None:
+            row = await self.storage.fetchone(
+                """
+                SELECT last_message_id
+                FROM stickymessage
+                WHERE guild_id = ?
+                AND channel_id = ?
+                """,
+                (channel.guild.id, channel.id)
+            )
+            previous = row and row[0]
+
+        if previous is not None:
+            try:
+                await channel.get_partial_message(previous).delete()
+            except NotFound:
+                pass
+            except HTTPException:
+                log.warning("Could not delete the previous sticky message in channel %s", channel.id)
+
+        sticky = await self.post(channel, template, message)
+        self.posted[channel.id] = sticky.id
+        self.reposts += 1
+        await self.storage.write(
+            """
+            UPDATE stickymessage
+            SET last_message_id = ?
+            WHERE guild_id = ?
+            AND channel_id = ?
+            """,
+            (sticky.id, channel.guild.id, channel.id),
+            write_class="sticky",
+            key=("stickymessage", channel.id)
+        )
@@ -0,0 +1,407 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple
+    )
+
+import aiosqlite
+
+from . import queryplan
+from .migrations import migrate
+from .writebehind import WriteBehind
+
+log = logging.getLogger(__name__)
+
+Job = Callable[[aiosqlite.Connection], Awaitable[Any]]
+
+
+class Rollback(Exception):
+    """
+    Raised inside a write job to discard its changes without failing the batch.
+    """
+
+
+class Transaction:
+    """
+    Statements issued on the writer connection while a transaction holds it.
+    """
+
+    def __init__(
+        self,
+        connection: aiosqlite.Connection
+    ):
+        self.connection = connection
+
+    async def execute(
+        self,
+        sql: str,
+        parameters: Sequence[Any] = ()
+    ) -> int:
+        async with self.connection.execute(sql, parameters) as cursor:
+            return cursor.rowcount
+
+    async def executemany(
+        self,
+        sql: str,
+        parameters: Iterable[Sequence[Any]]
+    ) -> int:
+        async with self.connection.executemany(sql, parameters) as cursor:
+            return cursor.rowcount
+
+    async def fetchone(
+        self,
+        sql: str,
+        parameters: Sequence[Any] = ()
+    ) -> Optional[Tuple[Any, ...]]:
+        async with self.connection.execute(sql, parameters) as cursor:
+            return await cursor.fetchone()
+
+    async def fetchall(
+        self,
+        sql: str,
+        parameters: Sequence[Any] = ()
+    ) -> List[Tuple[Any, ...]]:
+        async with self.connection.execute(sql, parameters) as cursor:
+            return list(await cursor.fetchall())
+
+
+class Storage:
+    """
+    WAL-mode front for the bot database.
+
+    SELECTs run on a small pool of read-only connections. Every write goes
+    through a queue to one writer task, which groups whatever is queued into
+    a single commit and isolates each job in its own savepoint.
+
+    Writes are tagged with a class, and ``durability`` decides per class
+    whether the caller waits for the commit (``"sync"``) or the write is
+    buffered and flushed later by ``deferred`` (``"deferred"``).
+    """
+
+    durability: Dict[str, str] = {
+        "moderation": "sync",
+        "analytics": "deferred",
+        "sticky": "deferred",
+        "cache": "deferred",
+    }
+    # Log queries that scan a whole table (see queryplan.py) once migrations ran.
+    check_plans = True
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        readers: int = 4,
+        max_batch: int = 128
+    ):
+        self.path = path
+        self.reader_count = readers
+        self.max_batch = max_batch
+        self.writer: Optional[aiosqlite.Connection] = None
+        self._readers: "asyncio.Queue[aiosqlite.Connection]" = asyncio.Queue()
+        self._reader_connections: List[aiosqlite.Connection] = []
+        self._queue: "asyncio.Queue[Tuple[Job, asyncio.Future]]" = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+        self.users = 0
+        self.deferred = WriteBehind(self)
+
+    @classmethod
+    async def attach(
+        cls,
+        bot,
+        *,
+        hold: bool = True
+    ) -> "Storage":
+        """
+        Return the storage shared by every cog, opening and migrating it on first use.
+
+        Every cog that attaches holds the storage until it calls ``release``,
+        services created on behalf of a cog pass ``hold=False``. A storage
+        closed by the last release is reopened in place, so services that
+        kept a reference to it keep working.
+        """
+        async with _attach_lock:
+            storage = getattr(bot, "storage", None)
+            if storage is None:
+                async with bot.db.execute("PRAGMA database_list") as cursor:
+                    path = next(row[2] for row in await cursor.fetchall() if row[1] == "main")
+
+                storage = cls(path)
+                await storage.open()
+                try:
+                    await migrate(storage)
+                except BaseException:
+                    await storage.close()
+                    raise
+
+                if storage.check_plans:
+                    await storage.check_query_plans()
+
+                bot.storage = storage
+            elif storage.writer is None:
+                await storage.open()
+
+            if hold:
+                storage.users += 1
+
+            return storage
+
+    @classmethod
+    async def release(
+        cls,
+        bot
+    ) -> None:
+        """
+        Drop a cog's hold on the shared storage, closing it once nothing holds it.
+        """
+        async with _attach_lock:
+            storage = getattr(bot, "storage", None)
+            if storage is None:
+                return
+
+            storage.users -= 1
+            if storage.users <= 0:
+                storage.users = 0
+                await storage.close()
+
+    async def check_query_plans(self) -> None:
+        """
+        Log every query in the cogs and services that would scan a whole table.
+        """
+        if not self.path or self.path == ":memory:":
+            return
+
+        try:
+            failures = await asyncio.to_thread(queryplan.check, self.path)
+        except Exception:
+            log.exception("Could not check the query plans")
+            return
+
+        for filename, line, detail in failures:
+            log.warning("Full table scan at %s:%d: %s", filename, line, detail)
+
+    async def open(self) -> None:
+        self.writer = await aiosqlite.connect(self.path, isolation_level=None)
+        await self.writer.execute("PRAGMA journal_mode = WAL")
+        await self.writer.execute("PRAGMA synchronous = NORMAL")
+        await self.writer.execute("PRAGMA busy_timeout = 5000")
+
+        for _ in range(self.reader_count if self.path else 0):
+            reader = await aiosqlite.connect(f"file:{self.path}?mode=ro", uri=True)
+            await reader.execute("PRAGMA busy_timeout = 5000")
+            self._reader_connections.append(reader)
+            self._readers.put_nowait(reader)
+
+        if not self._reader_connections:
+            # An in-memory database cannot be shared, read through the writer instead.
+            self._readers.put_nowait(self.writer)
+
+        self._task = asyncio.create_task(self._write_loop())
+        self.deferred.start()
+
+    async def close(self) -> None:
+        await self.deferred.close()
+
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+        for reader in self._reader_connections:
+            await reader.close()
+
+        self._reader_connections.clear()
+        self._readers = asyncio.Queue()
+        if self.writer is not None:
+            await self.writer.close()
+            self.writer = None
+
+    @asynccontextmanager
+    async def _reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        connection = await self._readers.get()
+        try:
+            yield connection
+        finally:
+            self._readers.put_nowait(connection)
+
+    async def fetchone(
+        self,
+        sql: str,
+        parameters: Sequence[Any] = ()
+    ) -> Optional[Tuple[Any, ...]]:
+        async with self._reader() as connection:
+            async with connection.execute(sql, parameters) as cursor:
+                return await cursor.fetchone()
+
+    async def fetchall(
+        self,
+        sql: str,
+        parameters: Sequence[Any] = ()
+    ) -> List[Tuple[Any, ...]]:
+        async with self._reader() as connection:
+            async with connection.execute(sql, parameters) as cursor:
+                return list(await cursor.fetchall())
+
+    def submit(
+        self,
+        job: Job
+    ) -> "asyncio.Future[Any]":
+        """
+        Queue a write job for the writer task, the future resolves after its commit.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((job, future))
+        return future
+
+    async def execute(
+        self,
+        sql: str,
+        parameters: Sequence[Any] = ()
+    ) -> int:
+        return await self.submit(lambda connection: Transaction(connection).execute(sql, parameters))
+
+    async def executemany(
+        self,
+        sql: str,
+        parameters: Iterable[Sequence[Any]]
+    ) -> int:
+        parameters = list(parameters)
+        return await self.submit(lambda connection: Transaction(connection).executemany(sql, parameters))
+
+    def deferrable(
+        self,
+        write_class: str
+    ) -> bool:
+        return self.durability.get(write_class, "sync") == "deferred"
+
+    async def write(
+        self,
+        sql: str,
+        parameters: Sequence[Any] = (),
+        *,
+        write_class: str = "moderation",
+        key: Optional[Any] = None
+    ) -> None:
+        """
+        Run a write, or buffer it when its class is deferred.
+        """
+        if self.deferrable(write_class):
+            self.deferred.write(sql, parameters, key=key)
+        else:
+            await self.execute(sql, parameters)
+
+    async def increment(
+        self,
+        sql: str,
+        key: Tuple[Any, ...],
+        amount: int = 1,
+        *,
+        write_class: str = "analytics"
+    ) -> None:
+        """
+        Bump a counter, ``sql`` takes ``(*key, amount)``.
+        """
+        if self.deferrable(write_class):
+            self.deferred.increment(sql, key, amount)
+        else:
+            await self.execute(sql, (*key, amount))
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[Transaction]:
+        """
+        Hold the writer for a multi-statement flow that commits or rolls back as one.
+
+        Only use the yielded transaction inside the block, queuing another
+        write from within it would wait on the writer forever.
+        """
+        loop = asyncio.get_running_loop()
+        acquired = loop.create_future()
+        release = loop.create_future()
+
+        async def job(connection: aiosqlite.Connection):
+            if not acquired.done():
+                acquired.set_result(Transaction(connection))
+
+            if not await release:
+                raise Rollback
+
+        future = self.submit(job)
+        try:
+            transaction = await acquired
+        except BaseException:
+            if not release.done():
+                release.set_result(False)
+            future.add_done_callback(lambda f: f.cancelled() or f.exception())
+            raise
+
+        try:
+            yield transaction
+        except BaseException:
+            release.set_result(False)
+            try:
+                await future
+            except Rollback:
+                pass
+            raise
+
+        release.set_result(True)
+        await future
+
+    async def _write_loop(self) -> None:
+        while True:
+            jobs = [await self._queue.get()]
+            while len(jobs) < self.max_batch and not self._queue.empty():
+                jobs.append(self._queue.get_nowait())
+
+            try:
+                await self._run_batch(jobs)
+            except Exception as exc:
+                log.exception("Write batch of %d jobs failed", len(jobs))
+                for _, future in jobs:
+                    if not future.done():
+                        future.set_exception(exc)
+
+    async def _run_batch(
+        self,
+        jobs: List[Tuple[Job, asyncio.Future]]
+    ) -> None:
+        await self.writer.execute("BEGIN IMMEDIATE")
+
+        results = []
+        try:
+            for job, future in jobs:
+                await self.writer.execute("SAVEPOINT job")
+                try:
+                    result = await job(self.writer)
+                except Exception as exc:
+                    await self.writer.execute("ROLLBACK TO job")
+                    await self.writer.execute("RELEASE job")
+                    if not future.done():
+                        future.set_exception(exc)
+                    continue
+
+                await self.writer.execute("RELEASE job")
+                results.append((future, result))
+
+            await self.writer.execute("COMMIT")
+        except Exception:
+            # A savepoint that cannot be rolled back or released leaves the batch half applied, so none of it is kept.
+            if self.writer.in_transaction:
+                await self.writer.execute("ROLLBACK")
+            raise
+
+        for future, result in results:
+            if not future.done():
+                future.set_result(result)
+
+
+_attach_lock = asyncio.Lock()
@@ -0,0 +1,98 @@
+from datetime import datetime
+from typing import (
+    Dict,
+    List
+    )
+
+from discord import Guild, Member
+from discord.utils import utcnow
+
+
+class TimeoutIndex:
+    """
+    Per-guild map of timed out member IDs to when their timeout ends.
+
+    A guild's map is built once, the first time it is queried after the
+    guild has been chunked, then kept current from member updates and
+    pruned of expired entries whenever it is read.
+    """
+
+    def __init__(self):
+        self._guilds: Dict[int, Dict[int, datetime]] = {}
+
+    @classmethod
+    def attach(
+        cls,
+        bot
+    ) -> "TimeoutIndex":
+        """
+        Return the index shared by every cog, creating it on first use.
+        """
+        index = getattr(bot, "timeouts", None)
+        if index is None:
+            index = bot.timeouts = cls()
+
+        return index
+
+    def _timeouts(
+        self,
+        guild: Guild
+    ) -> Dict[int, datetime]:
+        timeouts = self._guilds.get(guild.id)
+        if timeouts is None:
+            timeouts = {
+                member.id: member.timed_out_until
+                for member in guild.members
+                if member.timed_out_until
+            }
+            if guild.chunked:
+                self._guilds[guild.id] = timeouts
+
+        return timeouts
+
+    def update(
+        self,
+        member: Member
+    ) -> None:
+        timeouts = self._guilds.get(member.guild.id)
+        if timeouts is None:
+            return
+
+        if member.timed_out_until and member.timed_out_until > utcnow():
+            timeouts[member.id] = member.timed_out_until
+        else:
+            timeouts.pop(member.id, None)
+
+    def remove(
+        self,
+        member: Member
+    ) -> None:
+        timeouts = self._guilds.get(member.guild.id)
+        if timeouts is not None:
+            timeouts.pop(member.id, None)
+
+    def forget(
+        self,
+        guild: Guild
+    ) -> None:
+        self._guilds.pop(guild.id, None)
+
+    def active(
+        self,
+        guild: Guild
+    ) -> List[Member]:
+        """
+        Return the members whose timeout has not ended yet, soonest to end first.
+        """
+        now = utcnow()
+        timeouts = self._timeouts(guild)
+        for member_id in [member_id for member_id, until in timeouts.items() if until <= now]:
+            del timeouts[member_id]
+
+        members = []
+        for member_id, _ in sorted(timeouts.items(), key=lambda item: item[1]):
+            member = guild.get_member(member_id)
+            if member:
+                members.append(member)
+
+        return members
@@ -0,0 +1,142 @@
+import asyncio
+from collections import OrderedDict
+from time import monotonic
+from typing import (
+    Dict,
+    Iterable,
+    Optional,
+    Tuple
+    )
+
+from discord import HTTPException, NotFound, User
+
+
+class UserResolver:
+    """
+    Resolve user IDs through the gateway cache, then a cache of fetched users.
+
+    Fetched users are kept in an LRU with a TTL, deleted accounts are kept
+    in the same LRU as a negative entry with a shorter TTL. Concurrent
+    lookups of one ID share a single fetch, and every fetch goes through a
+    semaphore so bulk lookups cannot flood the REST bucket.
+    """
+
+    def __init__(
+        self,
+        bot,
+        *,
+        maxsize: int = 10000,
+        ttl: float = 3600,
+        negative_ttl: float = 600,
+        concurrency: int = 8
+    ):
+        self.bot = bot
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.hits = 0
+        self.misses = 0
+        self._users: "OrderedDict[int, Tuple[float, Optional[User]]]" = OrderedDict()
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    @classmethod
+    def attach(
+        cls,
+        bot
+    ) -> "UserResolver":
+        """
+        Return the resolver shared by every cog, creating it on first use.
+        """
+        resolver = getattr(bot, "user_resolver", None)
+        if resolver is None:
+            resolver = bot.user_resolver = cls(bot)
+
+        return resolver
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._users),
+            "hits": self.hits,
+            "misses": self.misses,
+            "pending": len(self._pending),
+        }
+
+    def cached(
+        self,
+        user_id: int
+    ) -> Tuple[bool, Optional[User]]:
+        """
+        Return ``(found, user)`` without fetching, ``user`` is None for deleted accounts.
+        """
+        user = self.bot.get_user(user_id)
+        if user is not None:
+            return True, user
+
+        entry = self._users.get(user_id)
+        if entry is None:
+            return False, None
+
+        expires, user = entry
+        if expires <= monotonic():
+            del self._users[user_id]
+            return False, None
+
+        self._users.move_to_end(user_id)
+        return True, user
+
+    async def resolve(
+        self,
+        user_id: int
+    ) -> Optional[User]:
+        found, user = self.cached(user_id)
+        if found:
+            self.hits += 1
+            return user
+
+        self.misses += 1
+        future = self._pending.get(user_id)
+        if future is None:
+            future = self._pending[user_id] = asyncio.ensure_future(self._fetch(user_id))
+            future.add_done_callback(lambda _: self._pending.pop(user_id, None))
+
+        return await asyncio.shield(future)
+
+    async def resolve_many(
+        self,
+        user_ids: Iterable[int]
+    ) -> Dict[int, Optional[User]]:
+        """
+        Resolve every ID, fetching the missing ones concurrently.
+        """
+        user_ids = list(dict.fromkeys(user_ids))
+        users = await asyncio.gather(*(self.resolve(user_id) for user_id in user_ids))
+        return dict(zip(user_ids, users))
+
+    async def _fetch(
+        self,
+        user_id: int
+    ) -> Optional[User]:
+        async with self._semaphore:
+            try:
+                user = await self.bot.fetch_user(user_id)
+            except NotFound:
+                self._store(user_id, None, self.negative_ttl)
+                return None
+            except HTTPException:
+                return None
+
+        self._store(user_id, user, self.ttl)
+        return user
+
+    def _store(
+        self,
+        user_id: int,
+        user: Optional[User],
+        ttl: float
+    ) -> None:
+        self._users[user_id] = (monotonic() + ttl, user)
+        self._users.move_to_end(user_id)
+        while len(self._users) > self.maxsize:
+            self._users.popitem(last=False)
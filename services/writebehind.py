@@ -0,0 +1,133 @@
+import asyncio
+import logging
+from collections import defaultdict
+from typing import (
+    Any,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Sequence,
+    Tuple
+    )
+
+import aiosqlite
+
+log = logging.getLogger(__name__)
+
+
+class WriteBehind:
+    """
+    Buffer fire-and-forget writes in memory and flush them as one write job.
+
+    Counter increments for the same statement and key are summed, and
+    keyed writes keep only the latest parameters, so a burst of commands
+    turns into a handful of rows in a single commit.
+    """
+
+    def __init__(
+        self,
+        storage,
+        *,
+        interval: float = 0.5,
+        threshold: int = 1000
+    ):
+        self.storage = storage
+        self.interval = interval
+        self.threshold = threshold
+        self._counters: Dict[str, Dict[Tuple[Any, ...], int]] = defaultdict(lambda: defaultdict(int))
+        self._writes: Dict[Hashable, Tuple[str, Sequence[Any]]] = {}
+        self._operations = 0
+        self._sequence = 0
+        self._full = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return self._operations
+
+    def increment(
+        self,
+        sql: str,
+        key: Tuple[Any, ...],
+        amount: int = 1
+    ) -> None:
+        """
+        Add ``amount`` to a counter, ``sql`` is run with ``(*key, total)`` on flush.
+        """
+        self._counters[sql][key] += amount
+        self._added()
+
+    def write(
+        self,
+        sql: str,
+        parameters: Sequence[Any] = (),
+        *,
+        key: Optional[Hashable] = None
+    ) -> None:
+        """
+        Buffer a write, a later write with the same ``key`` replaces it.
+        """
+        if key is None:
+            self._sequence += 1
+            key = ("sequence", self._sequence)
+
+        self._writes[key] = (sql, parameters)
+        self._added()
+
+    def _added(self) -> None:
+        self._operations += 1
+        if self._operations >= self.threshold:
+            self._full.set()
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """
+        Stop the flush loop and write out whatever is still buffered.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+        await self.flush()
+
+    async def flush(self) -> int:
+        """
+        Write every buffered operation in one job, returns how many were flushed.
+        """
+        if not self._operations:
+            return 0
+
+        counters, writes, operations = self._counters, self._writes, self._operations
+        self._counters = defaultdict(lambda: defaultdict(int))
+        self._writes = {}
+        self._operations = 0
+        self._full.clear()
+
+        statements: List[Tuple[str, List[Sequence[Any]]]] = [
+            (sql, [(*key, amount) for key, amount in totals.items()])
+            for sql, totals in counters.items()
+        ]
+        for sql, parameters in writes.values():
+            statements.append((sql, [parameters]))
+
+        async def job(connection: aiosqlite.Connection):
+            for sql, parameters in statements:
+                await connection.executemany(sql, parameters)
+
+        await self.storage.submit(job)
+        return operations
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._full.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+            try:
+                await self.flush()
+            except Exception:
+                log.exception("Write-behind flush failed")